@@ -0,0 +1,131 @@
+############################################
+#     PID + FEED-FORWARD POSE TRACKING     #
+#  Closes the loop on mission setpoints    #
+#  for one or many robots / gain sets      #
+############################################
+
+import numpy as np
+
+def setpoint(bodyPose, bodyVel, t, mission_dt):
+    """mission pose (linearly interpolated, shortest-arc heading) and twist (zero-order hold) at scalar or (T,) t"""
+    n = bodyPose.shape[-2]
+    s = np.minimum(np.asarray(t, dtype=np.float64) / mission_dt, n - 1)
+    k = np.minimum(s.astype(np.int64), n - 2)
+    a, b = bodyPose[..., k, :], bodyPose[..., k + 1, :]
+    pose = a + (s - k)[..., None] * PID.error(b, a)
+    return pose, bodyVel[..., s.astype(np.int64), :]
+
+class PID:
+    """
+    Vectorized PID with velocity feed-forward on (B,3) pose errors [x, y, theta]
+    in the global frame. Gains are scalars, per axis (3,) or per controller (B,3),
+    so B robots or B gain sets are updated together as arrays.
+    """
+    def __init__(self, kp, ki=0.0, kd=0.0, kff=1.0, dt=0.01, i_limit=None, limit=None):
+        self.kp = np.asarray(kp, dtype=np.float64)
+        self.ki = np.asarray(ki, dtype=np.float64)
+        self.kd = np.asarray(kd, dtype=np.float64)
+        self.kff = np.asarray(kff, dtype=np.float64)
+        self.dt = dt
+        # Anti-windup clamp of the integral and output twist clamp (per axis)
+        self.i_limit = None if i_limit is None else np.asarray(i_limit, dtype=np.float64)
+        self.limit = None if limit is None else np.asarray(limit, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self.prev_error = None
+
+    @staticmethod
+    def error(sp_pose, pose):
+        """setpoint - pose with theta wrapped to [-pi, pi)"""
+        e = sp_pose - pose
+        e[..., 2] = (e[..., 2] + np.pi) % (2*np.pi) - np.pi
+        return e
+
+    def update(self, sp_pose, sp_vel, pose):
+        """global frame body twist (B,3) driving pose towards sp_pose while following sp_vel"""
+        e = self.error(sp_pose, pose)
+
+        # Integral (clamped) and Derivative (zero on first step)
+        self.integral = self.integral + e * self.dt
+        if self.i_limit is not None:
+            self.integral = np.clip(self.integral, -self.i_limit, self.i_limit)
+        derivative = 0.0 if self.prev_error is None else (e - self.prev_error) / self.dt
+        self.prev_error = e
+
+        twist = self.kff * sp_vel + self.kp * e + self.ki * self.integral + self.kd * derivative
+        if self.limit is not None:
+            twist = np.clip(twist, -self.limit, self.limit)
+        return twist
+
+class Tracker:
+    """
+    Closed-loop mission tracking of B robots: the PID twist goes through inverse
+    kinematics to wheel commands, wheels follow with a first-order lag and speed
+    limit, and forward kinematics integrates the simulated pose.
+    """
+    def __init__(self, Kinematics, bodyPose, bodyVel, pid, robots=1, dt=0.01, mission_dt=0.02,
+                 tau=0.0, wheel_limit=None, pose0=None):
+        self.Kinematics = Kinematics
+        # Mission shared by all robots (N,3) or one per robot (B,N,3)
+        self.bodyPose = np.asarray(bodyPose, dtype=np.float64)
+        self.bodyVel = np.asarray(bodyVel, dtype=np.float64)
+        self.pid = pid
+        self.robots = robots
+        self.dt = dt
+        self.mission_dt = mission_dt
+        self.tau = tau
+        self.wheel_limit = wheel_limit
+        self.pose0 = pose0
+        self.duration = (self.bodyPose.shape[-2] - 1) * mission_dt
+        self.reset()
+
+    def reset(self):
+        self.t = 0.0
+        self.steps = 0
+        start = self.bodyPose[..., 0, :] if self.pose0 is None else self.pose0
+        self.pose = np.array(np.broadcast_to(start, (self.robots, 3)), dtype=np.float64)
+        self.wheel = np.zeros((self.robots, self.Kinematics.wheels))
+        self.pid.reset()
+
+    def setpoint(self, t):
+        return setpoint(self.bodyPose, self.bodyVel, t, self.mission_dt)
+
+    def step(self):
+        sp_pose, sp_vel = self.setpoint(self.t)
+
+        # Twist From Controller -> Wheel Command
+        twist = self.pid.update(sp_pose, sp_vel, self.pose)
+        command = self.Kinematics.inverse_batch(np.broadcast_to(twist, self.pose.shape), self.pose[:,2])
+        if self.wheel_limit is not None:
+            command = np.clip(command, -self.wheel_limit, self.wheel_limit)
+
+        # Wheel Response (first-order lag)
+        if self.tau > 0:
+            self.wheel += (command - self.wheel) * min(self.dt / self.tau, 1.0)
+        else:
+            self.wheel = command
+
+        # Update Pose From Wheels
+        self.pose += self.Kinematics.forward_batch(self.wheel, self.pose[:,2]) * self.dt
+        self.pose[:,2] = (self.pose[:,2] + np.pi) % (2*np.pi) - np.pi
+        self.steps += 1
+        self.t = self.steps * self.dt
+
+    def run(self, duration=None, record=True):
+        """step until duration (default: end of mission), return (T,) time and (B,T,3) poses if recording"""
+        end = self.duration if duration is None else duration
+        t, poses = [], []
+        while self.t < end:
+            self.step()
+            if record:
+                t.append(self.t)
+                poses.append(self.pose.copy())
+        if not record:
+            return None
+        return np.array(t), np.stack(poses, axis=1)
+
+    def tracking_error(self, t, poses):
+        """(B,T,3) pose error w.r.t. the mission at recorded (T,) times"""
+        return PID.error(self.setpoint(t)[0], poses)
@@ -0,0 +1,96 @@
+############################################
+#        BATCH LOG DIRECTORY ANALYSIS      #
+#  Runs parse / align / odometry on every  #
+#  log in a directory over a process pool  #
+############################################
+
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import metrics
+from csv_parse import csv, parse
+
+# Per-file error trace is decimated to at most this many rows
+TRACE_SAMPLES = 500
+
+def analyze(filename, config_path, method="euler", cache=True, samples=TRACE_SAMPLES, windows=(1000.0,)):
+    """
+    Full pipeline on one log: load + align, ENCtoRaw and RawtoENC odometry and
+    their accuracy metrics against GFC (RPE over windows of travelled mm).
+    Return only summary metrics and a decimated float32 trace [t, position error,
+    heading drift] so workers send back a few KB instead of the parsed arrays.
+    """
+    log = parse(filename, cache)
+    RawtoENC = log.get_RawtoENC(config_path, method)
+    # Repeated encoder timestamps give non-finite wheel speeds, left out of the peak
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ENCtoRaw = log.get_ENCtoRaw(config_path)
+    wheel = np.abs(ENCtoRaw[:,1:])
+    wheel = wheel[np.isfinite(wheel)]
+
+    # Odometry Error On Camera Timestamps (rows are aligned by t_align)
+    GFC = log.GFC
+    summary = {"rows": len(GFC),
+               "duration_s": (GFC[-1,0] - GFC[0,0]) * 1e-3,
+               "peak_wheel": wheel.max() if len(wheel) else 0.0}
+    summary.update(metrics.evaluate(RawtoENC, GFC, windows))
+
+    position, _ = metrics.ate(RawtoENC, GFC)
+    heading, _ = metrics.drift(RawtoENC, GFC)
+    stride = max(1, -(-len(GFC) // samples))
+    trace = np.column_stack([GFC[:,0], position, heading])[::stride].astype(np.float32)
+    return {"file": filename, "metrics": summary, "trace": trace}
+
+def report(done, total, elapsed):
+    """default progress callback: one line per percent of files"""
+    if done == total or done % max(1, total // 100) == 0:
+        print(f"[{done}/{total}] {done / elapsed:6.1f} files/s", file=sys.stderr)
+
+def analyze_all(path, config_path, workers=None, method="euler", cache=True, progress=report):
+    """
+    Analyze every CSV log under path on a process pool (workers=None: one per core).
+    Return {log name: analyze result} keyed by the path relative to path without
+    ".csv" (e.g. "robot_3/day_2/run"), so same-named logs in different
+    subdirectories stay apart; failed logs get {"file", "error"} instead.
+    """
+    files = sorted(csv.get_files_from_path(path))
+    results = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze, filename, config_path, method, cache): filename for filename in files}
+        for done, future in enumerate(as_completed(futures), 1):
+            filename = futures[future]
+            keyname = os.path.relpath(filename, path)[:-4].replace(os.sep, "/")
+            try:
+                results[keyname] = future.result()
+            except Exception as e:
+                results[keyname] = {"file": filename, "error": repr(e)}
+            if progress is not None:
+                progress(done, len(files), time.perf_counter() - start)
+    return results
+
+def summarize(results):
+    """metric name -> (N,) array over successfully analyzed logs (sorted by name)"""
+    ok = [results[name]["metrics"] for name in sorted(results) if "metrics" in results[name]]
+    return {key: np.array([m[key] for m in ok]) for key in (ok[0] if ok else {})}
+
+# Nightly Batch Entry Point: python batch.py <log dir> <drive config> [workers]
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit("usage: python batch.py <log dir> <drive config> [workers]")
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    t0 = time.perf_counter()
+    results = analyze_all(sys.argv[1], sys.argv[2], workers)
+    elapsed = time.perf_counter() - t0
+
+    failed = [name for name in results if "error" in results[name]]
+    table = summarize(results)
+    print(f"{len(results)} logs ({len(failed)} failed) in {elapsed:.1f} s -> {len(results) / elapsed:.1f} files/s")
+    for key, values in table.items():
+        print(f"{key:>18} | mean {np.nanmean(values):12.3f} | max {np.nanmax(values):12.3f}")
+    for name in failed:
+        print(f"{name}: {results[name]['error']}")
@@ -0,0 +1,36 @@
+"""
+Benchmark batch analysis of a log directory: serial analyze() loop vs
+analyze_all() on process pools of growing size.
+Run from repository root: python -m benchmark.batch
+"""
+import os
+import time
+import tempfile
+from batch import analyze, analyze_all
+from csv_parse import csv
+from benchmark.synthetic import write_log_csv, omni_kinematics
+
+LOGS = 32
+ROWS = 50_000
+
+if __name__ == "__main__":
+    Kinematics = omni_kinematics()
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        for k in range(LOGS):
+            write_log_csv(os.path.join(tmp, f"robot_{k:03d}.csv"), ROWS, seed=k)
+        files = sorted(csv.get_files_from_path(tmp))
+
+        # Cold Runs (no binary cache) So Every Pass Parses The CSVs
+        t0 = time.perf_counter()
+        for filename in files:
+            analyze(filename, Kinematics, cache=False)
+        serial = time.perf_counter() - t0
+        print(f"serial        | {LOGS / serial:6.1f} files/s")
+
+        for workers in sorted({1, 2, 4, cores}):
+            t0 = time.perf_counter()
+            results = analyze_all(tmp, Kinematics, workers=workers, cache=False, progress=None)
+            pool = time.perf_counter() - t0
+            failed = sum("error" in r for r in results.values())
+            print(f"{workers:>2} workers    | {LOGS / pool:6.1f} files/s | {serial / pool:5.2f}x serial | {failed} failed ({cores} cores)")
@@ -0,0 +1,35 @@
+"""
+Benchmark cold (CSV) vs warm (binary cache) startup of parse and Utility.parse_csv.
+Run from repository root: python -m benchmark.cache
+"""
+import os
+import time
+import shutil
+import tempfile
+from csv_parse import parse
+from include.Utility.utility import Utility
+from benchmark.synthetic import write_log_csv
+
+def startup(fn, filename):
+    shutil.rmtree(filename + ".cache", ignore_errors=True)
+    t0 = time.perf_counter()
+    fn(filename)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fn(filename)
+    warm = time.perf_counter() - t0
+    return cold, warm
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        # Mission (copied so the repository tree stays clean)
+        mission = os.path.join(tmp, "test.csv")
+        shutil.copy(os.path.join(os.path.dirname(os.path.dirname(__file__)), "mission", "test.csv"), mission)
+        cold, warm = startup(Utility.parse_csv, mission)
+        print(f"mission test.csv    | cold {cold*1e3:8.1f} ms | warm {warm*1e3:6.2f} ms")
+
+        for n in (100_000, 1_000_000):
+            filename = os.path.join(tmp, f"log_{n}.csv")
+            write_log_csv(filename, n)
+            cold, warm = startup(parse, filename)
+            print(f"log {n:>9} rows | cold {cold*1e3:8.1f} ms | warm {warm*1e3:6.2f} ms")
@@ -0,0 +1,72 @@
+"""
+Benchmark kinematic calibration on a synthetic 1 hour log: per-window dead-reckoning
+loop (one candidate geometry at a time) vs batched Calibration.fit, and how well
+the perturbed "true" geometry is recovered.
+Run from repository root: python -m benchmark.calibration
+"""
+import os
+import time
+import tempfile
+import numpy as np
+from types import SimpleNamespace
+from calibration import Calibration
+from kinematics import kinematics
+from benchmark.synthetic import drive_log
+
+CONFIG = "config/drive/fmlx_rover.yaml"
+LEGACY_MAX_WINDOWS = 500
+
+def legacy_cost(IKV, GFC, rawENC, window, heading_weight):
+    """windowed odometry cost of one geometry, integrating every window step by step"""
+    KV = np.linalg.inv(IKV)
+    total, count = 0.0, 0
+    for i in range(min(len(GFC) - window, LEGACY_MAX_WINDOWS)):
+        x, y, th = GFC[i,1], GFC[i,2], GFC[i,3]
+        for k in range(i+1, i+window+1):
+            dt = (rawENC[k,0] - rawENC[k-1,0]) * 1e-3
+            v = KV @ rawENC[k,1:4]
+            x += (np.cos(th)*v[0] - np.sin(th)*v[1]) * dt
+            y += (np.sin(th)*v[0] + np.cos(th)*v[1]) * dt
+            th += v[2] * dt
+        c, s = np.cos(GFC[i,3]), np.sin(GFC[i,3])
+        ex = c*(x - GFC[i+window,1]) + s*(y - GFC[i+window,2])
+        ey = c*(y - GFC[i+window,2]) - s*(x - GFC[i+window,1])
+        eth = (th - GFC[i+window,3] + np.pi) % (2*np.pi) - np.pi
+        total += ex**2 + ey**2 + (heading_weight*eth)**2
+        count += 3
+    return total / count
+
+if __name__ == "__main__":
+    nominal = Calibration.load(CONFIG)
+    x0 = Calibration.pack(nominal)
+    # True Geometry: Few Degrees / mm And 2% Wheel Radius Off The Hand Measurement
+    x_true = x0 + np.array([0.03, -0.02, 0.04, 2.5, -1.5, 3.0, 0.02])
+    GFC, rawENC = drive_log(3600, Calibration.matrices(x_true)[0], rate_hz=30)
+
+    t0 = time.perf_counter()
+    calibration = Calibration([SimpleNamespace(GFC=GFC, rawENC=rawENC)], CONFIG, window=1000.0)
+    geometry = calibration.fit()
+    fit = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    legacy_cost(Calibration.matrices(x0)[0], GFC, rawENC, 30, calibration.heading_weight)
+    per_window = (time.perf_counter() - t0) / LEGACY_MAX_WINDOWS
+    legacy = per_window * len(calibration.i) * calibration.evaluations
+
+    before, after = calibration.errors(x0), calibration.errors(calibration.x)
+    print(f"{len(GFC)} samples ({len(GFC) / 30 / 3600:.0f} h @ 30 Hz), {calibration.evaluations} candidates")
+    print(f"loop {legacy / 3600:8.1f} h (extrapolated) | batched fit {fit:6.2f} s | {legacy / fit:8.0f}x")
+    print(f"window error {before['translation_rms']:.2f} mm / {before['heading_rms_deg']:.3f} deg -> "
+          f"{after['translation_rms']:.2f} mm / {after['heading_rms_deg']:.3f} deg")
+    print(f"parameter error |x - x_true|: nominal {np.abs(x0 - x_true).max():.4f} -> fit {np.abs(calibration.x - x_true).max():.4f}")
+    print({key: round(value, 3) for key, value in geometry.items()})
+
+    # Saved Config Must Compile To The Fitted Model
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "calibrated.yaml")
+        calibration.save(out_path, geometry)
+        saved = kinematics(out_path)
+        fitted = Calibration.matrices(calibration.x)[0] * calibration.pulse_per_mm
+        error = np.abs(saved.IKV * saved.pulse_per_mm - fitted).max()
+        print(f"save -> load IKV max diff {error:.1e}")
+        assert error < 1e-9, "calibrated config does not reproduce the fitted model"
@@ -0,0 +1,78 @@
+"""
+Benchmark footprint collision checking: per-pose footprint sampling loop vs
+FootprintCollision batch checks (with and without the distance transform prefilter)
+over many shifted copies of mission/test.csv, and the one-time distance transform
+setup cost on growing maps.
+Run from repository root: python -m benchmark.collision
+"""
+import os
+import time
+import tracemalloc
+import numpy as np
+from occupancy import OccupancyGrid
+from collision import FootprintCollision, distance_transform
+from include.Utility.utility import Utility
+
+MISSIONS = 1000
+LEGACY_MAX_POSES = 20_000
+SETUP_SIZES = (1000, 2000, 4000, 8000)
+
+def legacy_collides(grid, points, poses):
+    """transform sampled footprint points and look them up, one pose at a time"""
+    return np.array([(grid.value(Utility.transform_2D(points, pose)) != OccupancyGrid.FREE).any() for pose in poses])
+
+if __name__ == "__main__":
+    root = os.path.dirname(os.path.dirname(__file__))
+    bodyPose, _ = Utility.parse_csv(os.path.join(root, "mission", "test.csv"), cache=False)
+
+    # 4 m x 4 m Floor At 10 mm Cells With Scattered Obstacles
+    rng = np.random.default_rng(0)
+    cells = np.zeros((400, 400), dtype=np.uint8)
+    cells[rng.random(cells.shape) < 0.00005] = OccupancyGrid.OCCUPIED
+    grid = OccupancyGrid(cells, resolution=10.0, origin=(-1000.0, -1000.0))
+
+    # Missions Shifted Around The Floor
+    shift = np.column_stack([rng.uniform(-800, 800, MISSIONS), rng.uniform(-800, 200, MISSIONS), np.zeros(MISSIONS)])
+    poses = bodyPose[None] + shift[:, None]
+    t = np.arange(bodyPose.shape[0]) * 0.02
+    config = os.path.join(root, "config", "drive", "fmlx_rover.yaml")
+
+    t0 = time.perf_counter()
+    checker = FootprintCollision.from_config(grid, config, precompute=False)
+    setup = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    checker.distance()
+    dt = time.perf_counter() - t0
+    print(f"setup {checker.offsets.shape[1]} cells x {checker.headings} headings {setup*1e3:7.1f} ms | distance transform {dt*1e3:7.1f} ms")
+
+    flat = poses.reshape(-1, 3)
+    n = min(len(flat), LEGACY_MAX_POSES)
+    points = FootprintCollision.sample(checker.polygons, grid.resolution * 0.5)
+    t0 = time.perf_counter()
+    legacy_collides(grid, points, flat[:n])
+    legacy = (time.perf_counter() - t0) / n
+
+    plain = FootprintCollision.from_config(grid, config, precompute=False)
+    t0 = time.perf_counter()
+    plain.collides(poses)
+    batch = (time.perf_counter() - t0) / len(flat)
+    t0 = time.perf_counter()
+    first, clearance = checker.validate(poses, t)
+    prefilter = (time.perf_counter() - t0) / len(flat)
+
+    print(f"{len(flat)} poses ({MISSIONS} missions, {np.isfinite(first).sum()} collide)")
+    print(f"per-pose loop  | {legacy*1e6:8.2f} us/pose")
+    print(f"batch          | {batch*1e6:8.2f} us/pose | {legacy/batch:6.1f}x")
+    print(f"batch + DT     | {prefilter*1e6:8.2f} us/pose | {legacy/prefilter:6.1f}x")
+
+    # One-Time Distance Transform Setup On Warehouse-Like Maps (racks + scattered clutter)
+    for n in SETUP_SIZES:
+        blocked = rng.random((n, n)) < 0.0005
+        blocked[::50, : n - n // 10] = True
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        distance_transform(blocked)
+        dt = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"distance transform {n:>5}^2 | {dt:6.2f} s | peak {peak / 2**20:7.1f} MiB ({peak / blocked.size:.1f} B/cell)")
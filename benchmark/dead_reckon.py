@@ -0,0 +1,46 @@
+"""
+Benchmark parse.dead_reckon (per-sample loop vs vectorized Euler / midpoint).
+Run from repository root: python -m benchmark.dead_reckon
+"""
+import time
+import numpy as np
+from csv_parse import parse
+from benchmark.synthetic import omni_kinematics, wheel_log
+
+LEGACY_MAX_ROWS = 100_000
+
+def legacy_dead_reckon(Kinematics, rawENC, th0):
+    """per-sample integration loop as shipped before the vectorized engine"""
+    output = []
+    result = np.array([[0.0], [0.0], [0.0]])
+    prev_th = 0
+    for k in range(1, len(rawENC)):
+        dt = (rawENC[k,0] - rawENC[k-1,0]) * 1e-3
+        w = np.array([[rawENC[k,1]], [rawENC[k,2]], [rawENC[k,3]]])
+        body_frame = Kinematics.rotation("global", Kinematics.rotation("global", Kinematics.forward(w), prev_th), th0)
+        result += (body_frame * dt)
+        if result[2,0] > np.pi : result[2,0] -= 2*np.pi
+        elif result[2,0] < -np.pi : result[2,0] += 2*np.pi
+        prev_th = result[2,0]
+        output.append([rawENC[k,0], result[0,0], result[1,0], result[2,0]+th0])
+    return np.array(output)
+
+if __name__ == "__main__":
+    Kinematics = omni_kinematics()
+    th0 = 0.3
+    for n in (10_000, 100_000, 1_000_000):
+        rawENC = wheel_log(n)
+        state = np.array([rawENC[0,0], 0.0, 0.0, 0.0])
+        line = f"{n:>9} rows"
+        for method in ("euler", "midpoint"):
+            t0 = time.perf_counter()
+            new, _ = parse.dead_reckon(Kinematics, rawENC[1:], th0, state, method)
+            line += f" | {method} {n/(time.perf_counter()-t0):12,.0f} samples/s"
+        if n <= LEGACY_MAX_ROWS:
+            t0 = time.perf_counter()
+            old = legacy_dead_reckon(Kinematics, rawENC, th0)
+            line += f" | legacy {n/(time.perf_counter()-t0):9,.0f} samples/s"
+            euler, _ = parse.dead_reckon(Kinematics, rawENC[1:], th0, state)
+            d_th = (old[:,3] - euler[:,3] + np.pi) % (2*np.pi) - np.pi
+            line += f" | max diff xy {np.abs(old[:,1:3]-euler[:,1:3]).max():.1e} th {np.abs(d_th).max():.1e}"
+        print(line)
@@ -0,0 +1,55 @@
+"""
+Benchmark per-frame RobotOmni.draw cost (per-wheel scalar geometry vs precomputed footprint).
+Run from repository root: python -m benchmark.draw
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import time
+import numpy as np
+import pygame
+import pygame.gfxdraw
+import oop_test
+from oop_test import RobotOmni
+from include.Utility.utility import Utility
+
+FRAMES = 2000
+
+def legacy_Rt_2DCenterRef(reference, pose):
+    _rotated = reference - np.array([pose[0], pose[1]])
+    for n in range(len(reference)): _rotated[n] = (Utility.Rt_2D(pose[2]) @ _rotated[n].reshape(-1,1)).reshape(1,-1)
+    _rotated += np.array([pose[0], pose[1]])
+    return _rotated
+
+def legacy_draw(self, screen, pose):
+    """RobotOmni.draw as shipped before the precomputed footprint"""
+    _pointRef = np.array([[pose[0]-self.widthRobot*0.5, pose[1]-self.lengthRobot*0.5],
+                          [pose[0]+self.widthRobot*0.5, pose[1]-self.lengthRobot*0.5],
+                          [pose[0]+self.widthRobot*0.5, pose[1]+self.lengthRobot*0.5],
+                          [pose[0]-self.widthRobot*0.5, pose[1]+self.lengthRobot*0.5]])
+    for i in range(len(self.dn)):
+        _wheelAngleRef = np.array([[pose[0] + (self.dn[i] * np.cos(self.bn[i]) - self.radiusWheel * np.sin(self.yn[i] + self.bn[i])), pose[1] + (self.dn[i] * -np.sin(self.bn[i]) - self.radiusWheel * np.cos(self.yn[i] + self.bn[i]))],
+                                   [pose[0] + (self.dn[i] * np.cos(self.bn[i]) + self.radiusWheel * np.sin(self.yn[i] + self.bn[i])), pose[1] + (self.dn[i] * -np.sin(self.bn[i]) + self.radiusWheel * np.cos(self.yn[i] + self.bn[i]))]])
+        _d = _wheelAngleRef[1] - _wheelAngleRef[0]
+        _n = self.widthWheel * 0.5 * np.array([-_d[1], _d[0]]) / (2*self.radiusWheel)
+        _wheelRef = np.array([_wheelAngleRef[0] + _n, _wheelAngleRef[0] - _n, _wheelAngleRef[1] - _n, _wheelAngleRef[1] + _n])
+        pygame.gfxdraw.filled_polygon(screen, legacy_Rt_2DCenterRef(_wheelRef, pose), oop_test.RED)
+        pygame.gfxdraw.aapolygon(screen, legacy_Rt_2DCenterRef(_wheelRef, pose), oop_test.RED)
+    pygame.draw.aalines(screen, oop_test.BLACK, True, legacy_Rt_2DCenterRef(_pointRef, pose), 3)
+
+def frame_cost(draw, robot, screen, poses):
+    t0 = time.perf_counter()
+    for pose in poses:
+        draw(robot, screen, pose)
+    return (time.perf_counter() - t0) / len(poses) * 1e6
+
+if __name__ == "__main__":
+    # Colors are module globals set up by Visualization
+    oop_test.BLACK, oop_test.RED = (0, 0, 0), (196, 30, 58)
+    screen = pygame.Surface((1280, 720))
+    robot = RobotOmni(os.path.join("config", "drive", "fmlx_rover.yaml"))
+    rng = np.random.default_rng(0)
+    poses = np.column_stack([rng.uniform(200, 1000, FRAMES), rng.uniform(200, 500, FRAMES), rng.uniform(-np.pi, np.pi, FRAMES)])
+
+    old = frame_cost(legacy_draw, robot, screen, poses)
+    new = frame_cost(RobotOmni.draw, robot, screen, poses)
+    print(f"RobotOmni.draw per frame | legacy {old:7.1f} us | new {new:7.1f} us | x{old/new:.1f}")
@@ -0,0 +1,36 @@
+"""
+Benchmark fleet rendering frame time (RobotOmni.draw_batch) for growing fleet sizes.
+Run from repository root: python -m benchmark.fleet
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import time
+import numpy as np
+import pygame
+import oop_test
+from oop_test import RobotOmni
+from player import TrajectoryPlayer
+from camera import Camera
+
+FRAMES = 200
+
+if __name__ == "__main__":
+    # Colors are module globals set up by Visualization
+    oop_test.BLACK, oop_test.RED = (0, 0, 0), (196, 30, 58)
+    screen = pygame.Surface((1280, 720))
+    robot = RobotOmni(os.path.join("config", "drive", "fmlx_rover.yaml"))
+    camera = Camera((64, 36, 1152, 648))
+    rng = np.random.default_rng(0)
+
+    for robots in (50, 100, 200):
+        # Random walks, some starting off-screen
+        start = np.column_stack([rng.uniform(-200, 1480, robots), rng.uniform(-200, 920, robots), rng.uniform(-np.pi, np.pi, robots)])
+        fleet = start[:,None,:] + np.cumsum(rng.normal(0, [2, 2, 0.02], (robots, 1000, 3)), axis=1)
+        player = TrajectoryPlayer(fleet)
+
+        t0 = time.perf_counter()
+        for _ in range(FRAMES):
+            player.update(1/60)
+            visible = len(robot.draw_batch(screen, player.pose(), camera))
+        frame = (time.perf_counter() - t0) / FRAMES
+        print(f"{robots:>4} robots ({visible} visible) | {frame*1e3:6.2f} ms/frame | {1/frame:6.0f} FPS")
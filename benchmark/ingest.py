@@ -0,0 +1,58 @@
+"""
+Benchmark log ingestion (string matrix + per-cell casts vs columnar load_log).
+Run from repository root: python -m benchmark.ingest
+"""
+import os
+import time
+import tempfile
+import tracemalloc
+import numpy as np
+from csv_parse import csv, parse
+from benchmark.synthetic import write_log_csv
+
+def legacy_split(filename):
+    """string matrix ingestion as shipped before load_log"""
+    result = csv.load_csv(filename)
+    ENC, GFC, rawENC = [], [], []
+    for k in range(1,len(result)):
+        time = np.float64(result[k,2]) - np.float64(result[1,2])
+        if result[k,0] == 'real_gfc':
+            th = np.radians(np.float32(result[k,10]))
+            GFC.append([time, np.float64(result[k,8]), np.float64(result[k,9]), th])
+            if (k == 1):
+                rawENC.append([time, 0, 0, 0])
+                ENC.append([time, np.float64(result[k,8]), np.float64(result[k,9]), np.radians(np.float64(result[k,10]))])
+        elif result[k,0] == 'real_encoder':
+            ENC.append([time, np.float64(result[k,8]), np.float64(result[k,9]), np.radians(np.float64(result[k,10]))])
+        elif result[k,0] == 'raw_encoder':
+            rawENC.append([time, np.float64(result[k,8]), np.float64(result[k,9]), np.float64(result[k,10])])
+    return np.array(GFC), np.array(ENC), np.array(rawENC)
+
+def new_split(filename):
+    return parse.split(*csv.load_log(filename))
+
+LEGACY_MAX_ROWS = 100_000
+
+def measure(fn, filename):
+    # Time and peak memory in separate runs (tracemalloc slows allocation)
+    t0 = time.perf_counter()
+    out = fn(filename)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(filename)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, elapsed, peak / 2**20
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (10_000, 100_000, 1_000_000):
+            filename = os.path.join(tmp, f"log_{n}.csv")
+            write_log_csv(filename, n)
+            new, t_new, m_new = measure(new_split, filename)
+            if n > LEGACY_MAX_ROWS:
+                print(f"{n:>9} rows | legacy skipped | new {t_new:7.3f} s {m_new:7.1f} MiB")
+                continue
+            old, t_old, m_old = measure(legacy_split, filename)
+            same = all(np.array_equal(a, b) for a, b in zip(old, new))
+            print(f"{n:>9} rows | legacy {t_old:7.3f} s {m_old:8.1f} MiB | new {t_new:7.3f} s {m_new:7.1f} MiB | x{t_old/t_new:.1f} | identical {same}")
@@ -0,0 +1,50 @@
+"""
+Benchmark the compiled kinematics models: building a model from YAML (cold vs
+cached per config), batched forward / inverse throughput of every drive model
+and single pose rotation over non-repeating headings.
+Run from repository root: python -m benchmark.kinematics
+"""
+import time
+import numpy as np
+from kinematics import kinematics
+from include.Utility.utility import Config
+
+CONFIGS = ("differential", "fmlx_rover", "omni", "mecanum")
+ROWS = 1_000_000
+REPEAT = 200
+POSES = 100_000
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    body = rng.normal(0, 300, (ROWS, 3))
+    th = rng.uniform(-np.pi, np.pi, ROWS)
+    for name in CONFIGS:
+        path = f"config/drive/{name}.yaml"
+
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            Config.parse.cache_clear()
+            kinematics.compile.cache_clear()
+            kinematics(path)
+        cold = (time.perf_counter() - t0) / REPEAT
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            Kinematics = kinematics(path)
+        cached = (time.perf_counter() - t0) / REPEAT
+
+        t0 = time.perf_counter()
+        wheel = Kinematics.inverse_batch(body, th)
+        Kinematics.forward_batch(wheel, th)
+        batch = time.perf_counter() - t0
+        print(f"{name:>12} | {Kinematics.model:>7} {Kinematics.wheels} wheels | build {cold*1e3:6.2f} ms cold, "
+              f"{cached*1e6:6.1f} us cached | inverse+forward {ROWS / batch / 1e6:5.1f} M rows/s")
+
+    # Single Pose Rotation (every heading different, as in simulation / dead reckoning)
+    twist = np.array([120.0, -40.0, 0.3])
+    out = np.empty(3)
+    for label, buffer in (("new array", None), ("out buffer", out)):
+        t0 = time.perf_counter()
+        for angle in th[:POSES].tolist():
+            Kinematics.rotation("global", twist, angle, buffer)
+        single = (time.perf_counter() - t0) / POSES
+        print(f"{'rotation':>12} | {label:>10} | {single*1e6:6.2f} us per pose")
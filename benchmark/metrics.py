@@ -0,0 +1,73 @@
+"""
+Benchmark odometry metrics: per-sample SE(2) matrix loop vs metrics.evaluate
+(ATE, 1 m RPE, drift, SE(2) aligned) on tracks of growing length. First checks
+that parse.get_RawtoENC + metrics.evaluate do not change when the whole log is
+moved by a constant world offset (odometry and GFC share one frame).
+Run from repository root: python -m benchmark.metrics
+"""
+import time
+import numpy as np
+import metrics
+from csv_parse import parse
+from benchmark.synthetic import drive_log, omni_kinematics
+
+LEGACY_MAX_ROWS = 20_000
+# World offset (mm) the evaluated log is moved by, and allowed metric change
+OFFSET = (1000.0, -2500.0)
+TOLERANCE = 1e-6
+
+def tracks(n, seed=0):
+    """ground truth loop at 10 ms and an odometry estimate with random-walk drift"""
+    rng = np.random.default_rng(seed)
+    s = np.linspace(0, n * 1e-4, n)
+    gt = np.column_stack([np.arange(n) * 10.0, 2000*np.cos(s), 1500*np.sin(2*s), metrics.wrap(3*s)])
+    est = gt.copy()
+    est[:,1:3] += np.cumsum(rng.normal(0, 0.05, (n, 2)), axis=0)
+    est[:,3] = metrics.wrap(est[:,3] + np.cumsum(rng.normal(0, 1e-5, n)))
+    return est, gt
+
+def legacy_rpe(est, gt, window):
+    """relative pose error with homogeneous matrices, one pair at a time"""
+    def T(p):
+        c, s = np.cos(p[3]), np.sin(p[3])
+        return np.array([[c, -s, p[1]], [s, c, p[2]], [0, 0, 1]])
+    errors = []
+    for i in range(len(gt) - window):
+        E = np.linalg.inv(np.linalg.inv(T(gt[i])) @ T(gt[i+window])) @ (np.linalg.inv(T(est[i])) @ T(est[i+window]))
+        errors.append([np.hypot(E[0,2], E[1,2]), abs(np.arctan2(E[1,0], E[0,0]))])
+    return np.array(errors)
+
+def log_metrics(GFC, rawENC, Kinematics):
+    """metrics.evaluate of RawtoENC odometry against GFC for an in-memory log"""
+    log = parse.__new__(parse)
+    log.GFC, log.rawENC, log.index = GFC, rawENC, {}
+    return metrics.evaluate(log.get_RawtoENC(Kinematics), GFC)
+
+def check_offset():
+    """metrics of a drive log and of the same log moved by OFFSET must agree"""
+    Kinematics = omni_kinematics()
+    GFC, rawENC = drive_log(120, Kinematics.IKV * Kinematics.pulse_per_mm)
+    moved = GFC.copy()
+    moved[:,1:3] += OFFSET
+    base, shifted = log_metrics(GFC, rawENC, Kinematics), log_metrics(moved, rawENC, Kinematics)
+    worst = max(abs(base[key] - shifted[key]) for key in base)
+    assert worst < TOLERANCE, f"metrics change by {worst:.3g} under a world offset"
+    print(f"offset check  | ate_rmse {base['ate_rmse']:.3f} mm, max change {worst:.1e} under {OFFSET} mm offset")
+
+if __name__ == "__main__":
+    check_offset()
+    for n in (10_000, 100_000, 1_000_000):
+        est, gt = tracks(n)
+        m = min(n, LEGACY_MAX_ROWS)
+        t0 = time.perf_counter()
+        legacy_rpe(est[:m], gt[:m], 100)
+        legacy = (time.perf_counter() - t0) * n / m
+
+        t0 = time.perf_counter()
+        metrics.rpe(est, gt, 100)
+        rpe = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        metrics.evaluate(est, gt, align=True)
+        full = time.perf_counter() - t0
+        print(f"{n:>9} samples | loop RPE {legacy*1e3:9.1f} ms | RPE {rpe*1e3:7.1f} ms ({legacy/rpe:6.0f}x) | "
+              f"evaluate {full*1e3:7.1f} ms")
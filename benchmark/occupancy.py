@@ -0,0 +1,59 @@
+"""
+Benchmark occupancy-grid maps: load time of a 10k x 10k PGM (cold convert vs warm
+memory-mapped cache) and GridView static-layer render time at several zoom levels.
+Run from repository root: python -m benchmark.occupancy
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import time
+import tempfile
+import numpy as np
+import pygame
+from camera import Camera
+from occupancy import OccupancyGrid
+from oop_test import GridView
+
+SIZE = 10_000
+
+def write_pgm(filename, size):
+    """synthetic warehouse: free floor, shelf rows and an unknown border"""
+    pixels = np.full((size, size), 254, dtype=np.uint8)
+    pixels[:, ::50][:, :] = 0
+    pixels[::400, :] = 254
+    pixels[:64], pixels[-64:], pixels[:, :64], pixels[:, -64:] = 205, 205, 205, 205
+    with open(filename, "wb") as outfile:
+        outfile.write(f"P5\n{size} {size}\n255\n".encode())
+        outfile.write(pixels.tobytes())
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.Surface((1280, 720))
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "warehouse.pgm")
+        write_pgm(filename, SIZE)
+
+        t0 = time.perf_counter()
+        grid = OccupancyGrid.load(filename, resolution=50.0)
+        cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        grid = OccupancyGrid.load(filename, resolution=50.0)
+        warm = time.perf_counter() - t0
+        print(f"load {SIZE}x{SIZE} PGM | cold {cold*1e3:8.1f} ms | warm {warm*1e3:6.2f} ms")
+
+        # Legacy Stub Built A Nested List Of The Same Size
+        t0 = time.perf_counter()
+        rows = [[0 for _ in range(SIZE)] for _ in range(SIZE // 10)]
+        legacy = (time.perf_counter() - t0) * 10
+        del rows
+        print(f"nested list grid     | {legacy*1e3:8.1f} ms (extrapolated from {SIZE // 10} rows)")
+
+        for scale in (0.5, 0.02, 0.002):
+            camera = Camera((64, 36, 1152, 648), scale, center=(SIZE * 25.0, SIZE * 25.0))
+            view = GridView(grid, camera)
+            t0 = time.perf_counter()
+            view.draw(screen)
+            cold = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            view.draw(screen)
+            warm = time.perf_counter() - t0
+            print(f"render scale {scale:<6} | {len(view._tiles):3d} tiles | cold {cold*1e3:7.1f} ms | cached {warm*1e3:6.2f} ms")
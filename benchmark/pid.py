@@ -0,0 +1,43 @@
+"""
+Benchmark a PID gain sweep over mission/test.csv: one Tracker per gain set in a
+Python loop vs all gain sets batched in a single Tracker.
+Run from repository root: python -m benchmark.pid
+"""
+import os
+import time
+import numpy as np
+from PID import PID, Tracker
+from include.Utility.utility import Utility
+from benchmark.synthetic import omni_kinematics
+
+LEGACY_MAX_SETS = 16
+
+def sweep(Kinematics, bodyPose, bodyVel, gains):
+    """(B,3) gain sets [kp, ki, kd] -> (B,) RMS position tracking error"""
+    pid = PID(gains[:, :1], gains[:, 1:2], gains[:, 2:3])
+    tracker = Tracker(Kinematics, bodyPose, bodyVel, pid, robots=len(gains), tau=0.05, pose0=bodyPose[0] + [20.0, -10.0, 0.1])
+    t, poses = tracker.run()
+    e = tracker.tracking_error(t, poses)
+    return np.sqrt((e[..., :2]**2).sum(axis=-1).mean(axis=-1))
+
+if __name__ == "__main__":
+    Kinematics = omni_kinematics()
+    bodyPose, bodyVel = Utility.parse_csv(os.path.join(os.path.dirname(os.path.dirname(__file__)), "mission", "test.csv"), cache=False)
+
+    rng = np.random.default_rng(0)
+    for sets in (16, 256, 4096):
+        gains = rng.uniform([0.0, 0.0, 0.0], [20.0, 2.0, 0.1], (sets, 3))
+
+        t0 = time.perf_counter()
+        rms = sweep(Kinematics, bodyPose, bodyVel, gains)
+        batch = time.perf_counter() - t0
+
+        n = min(sets, LEGACY_MAX_SETS)
+        t0 = time.perf_counter()
+        for g in gains[:n]:
+            sweep(Kinematics, bodyPose, bodyVel, g[None])
+        loop = (time.perf_counter() - t0) / n * sets
+
+        best = gains[np.argmin(rms)]
+        print(f"{len(gains):>5} gain sets | loop {loop:8.2f} s (extrapolated) | batch {batch:6.2f} s | {loop/batch:6.1f}x | "
+              f"best kp={best[0]:.1f} ki={best[1]:.2f} kd={best[2]:.2f} rms {rms.min():.2f} mm")
@@ -0,0 +1,54 @@
+"""
+Benchmark startup: import time (python -X importtime, best of several fresh
+interpreters) of the headless analysis modules vs numpy alone and the GUI application, which
+modules pull in yaml / pygame, and repeated drive config lookups through the
+registry vs parsing and compiling the YAML every time.
+Run from repository root: python -m benchmark.startup
+"""
+import sys
+import time
+import subprocess
+from kinematics import kinematics
+from include.Utility.utility import Config
+from csv_parse import parse
+
+HEADLESS = ("csv_parse", "metrics", "batch", "calibration", "simulation", "PID", "collision", "lidar")
+GUI = ("oop_test",)
+RUNS = 5
+LOOKUPS = 1000
+CONFIG = "config/drive/fmlx_rover.yaml"
+
+def import_time(module):
+    """(best cumulative import time in ms, yaml imported, pygame imported) of module in a fresh interpreter"""
+    best = None
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                              f"import sys, {module}; print('yaml' in sys.modules, 'pygame' in sys.modules)"],
+                             capture_output=True, text=True, env={"SDL_VIDEODRIVER": "dummy", "PYGAME_HIDE_SUPPORT_PROMPT": "1",
+                                                                   "PYTHONPATH": "."})
+        # Top-Level Imports Only (cumulative column already includes their children)
+        total = sum(int(line.split("|")[1]) for line in out.stderr.splitlines()
+                    if line.startswith("import time:") and "cumulative" not in line and line.split("|")[2][1] != " ")
+        best = total if best is None else min(best, total)
+    yaml, pygame = out.stdout.split()
+    return best * 1e-3, yaml == "True", pygame == "True"
+
+if __name__ == "__main__":
+    results = {module: import_time(module) for module in ("numpy",) + HEADLESS + GUI}
+    gui = max(results[module][0] for module in GUI)
+    base = results["numpy"][0]
+    for module, (ms, yaml, pygame) in results.items():
+        print(f"{module:>12} | import {ms:7.1f} ms ({ms / gui:4.0%} of GUI, {ms - base:6.1f} ms over numpy) | "
+              f"yaml {'yes' if yaml else 'no ':>3} | pygame {'yes' if pygame else 'no'}")
+
+    t0 = time.perf_counter()
+    for _ in range(LOOKUPS):
+        Config.parse.cache_clear()
+        kinematics.compile.cache_clear()
+        kinematics(CONFIG)
+    legacy = (time.perf_counter() - t0) / LOOKUPS
+    t0 = time.perf_counter()
+    for _ in range(LOOKUPS):
+        parse.get_kinematics(CONFIG)
+    shared = (time.perf_counter() - t0) / LOOKUPS
+    print(f"drive config lookup | parse + compile {legacy*1e6:8.1f} us | registry {shared*1e6:6.2f} us | {legacy / shared:6.0f}x")
@@ -0,0 +1,62 @@
+"""
+Check and benchmark streaming ingestion: parse_stream over a range of chunk sizes
+(down to a few lines, so duplicate timestamps straddle chunk boundaries) must give
+the batch parse GFC / ENC / rawENC / RawtoENC arrays (up to float rounding of the
+chunked interpolation / integration), and a malformed cell must stop both parsers
+with a ValueError naming the file instead of dropping rows.
+Run from repository root: python -m benchmark.stream
+"""
+import os
+import time
+import tempfile
+import numpy as np
+from csv_parse import parse, parse_stream
+from benchmark.synthetic import write_log_csv
+
+ROWS = 20_000
+CHUNKS = (7, 100, 1000, 50_000)
+CONFIG = "config/drive/fmlx_rover.yaml"
+TOLERANCE = 1e-9
+# Data line given a malformed x cell in the error check
+BAD_LINE = 1500
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "log.csv")
+        write_log_csv(filename, ROWS)
+        t0 = time.perf_counter()
+        batch = parse(filename, cache=False)
+        batch.get_RawtoENC(CONFIG)
+        elapsed = time.perf_counter() - t0
+        t = batch.rawENC[:,0]
+        print(f"{ROWS} rows | batch {elapsed*1e3:7.1f} ms | {len(t) - len(np.unique(t))} duplicate aligned timestamps")
+
+        for chunk_rows in CHUNKS:
+            t0 = time.perf_counter()
+            stream = parse_stream(filename, CONFIG, chunk_rows).run()
+            elapsed = time.perf_counter() - t0
+            error = {name: np.abs(getattr(stream, name) - getattr(batch, name)).max(axis=1)
+                     for name in ("GFC", "ENC", "rawENC", "RawtoENC")
+                     if getattr(stream, name).shape == getattr(batch, name).shape}
+            same = len(error) == 4 and all(e.max(initial=0) <= TOLERANCE for e in error.values())
+            detail = ", ".join(f"{name} {e.max(initial=0):.1e}" for name, e in error.items())
+            print(f"chunk {chunk_rows:>6} rows | stream {elapsed*1e3:8.1f} ms | match {same} | max diff {detail}")
+            assert same, f"stream output differs from batch parse at chunk_rows={chunk_rows}"
+
+        # Malformed Cell Raises Instead Of Silently Dropping Its Chunk
+        with open(filename) as infile:
+            lines = infile.readlines()
+        cells = lines[BAD_LINE].split(";")
+        cells[8] = "1.2.3"
+        lines[BAD_LINE] = ";".join(cells)
+        with open(filename, "w") as outfile:
+            outfile.writelines(lines)
+        for name, load in (("batch", lambda: parse(filename, cache=False)),
+                           ("stream", lambda: parse_stream(filename, CONFIG, 1000).run())):
+            try:
+                load()
+            except ValueError as e:
+                assert filename in str(e), e
+                print(f"malformed line {BAD_LINE + 1} | {name} raises: {e}")
+            else:
+                raise AssertionError(f"{name} parse accepted a malformed line")
@@ -0,0 +1,65 @@
+import numpy as np
+
+def log_arrays(n_rows: int, seed=0):
+    """return synthetic (GFC, rawENC) arrays with ~n_rows rows in total, time in ms"""
+    rng = np.random.default_rng(seed)
+    # Encoder at ~10ms, Camera at ~33ms (integer ms, jittered, with duplicates)
+    n_enc = int(n_rows * 0.77)
+    n_gfc = n_rows - n_enc
+    t_enc = np.cumsum(rng.integers(0, 21, n_enc)).astype(np.float64)
+    t_gfc = np.sort(rng.integers(0, int(t_enc[-1]) + 50, n_gfc)).astype(np.float64)
+
+    rawENC = np.column_stack([t_enc, rng.normal(0, 500, (n_enc, 3))])
+    GFC = np.column_stack([t_gfc, rng.normal(0, 1000, (n_gfc, 2)), rng.uniform(-np.pi, np.pi, n_gfc)])
+    return GFC, rawENC
+
+RECORD_NAMES = np.array(["real_gfc", "real_encoder", "raw_encoder"])
+
+def write_log_csv(path, n_rows: int, seed=0, delim=";"):
+    """write a synthetic telemetry log in the recorder's column layout (type;id;time;...;x;y;th;...)"""
+    rng = np.random.default_rng(seed)
+    kind = rng.choice(3, n_rows, p=[0.23, 0.1, 0.67])
+    kind[0] = 0
+    t = 1.7e12 + np.cumsum(rng.integers(0, 8, n_rows))
+    val = rng.normal(0, 500, (n_rows, 3))
+    with open(path, "w") as outfile:
+        outfile.write(delim.join(["type", "id", "time", "a", "b", "c", "d", "e", "x", "y", "th", "f"]) + "\n")
+        for k in range(n_rows):
+            outfile.write(f"{RECORD_NAMES[kind[k]]};{k};{t[k]:.0f};0;0;0;0;0;{val[k,0]:.4f};{val[k,1]:.4f};{val[k,2]:.4f};0\n")
+
+def omni_kinematics():
+    """kinematics model of the fmlx_rover drive config (3-wheel omni, 1 pulse per mm)"""
+    from kinematics import kinematics
+    return kinematics("config/drive/fmlx_rover.yaml")
+
+def wheel_log(n_rows: int, seed=0):
+    """return synthetic rawENC rows [t, w1, w2, w3] (smooth wheel speeds at ~33ms)"""
+    rng = np.random.default_rng(seed)
+    t = np.cumsum(rng.integers(25, 40, n_rows)).astype(np.float64)
+    w = np.cumsum(rng.normal(0, 5, (n_rows, 3)), axis=0)
+    return np.column_stack([t, w])
+
+def drive_log(seconds, IKV, rate_hz=30, seed=0, pose_noise=(1.0, 0.002), wheel_noise=2.0):
+    """
+    return aligned (GFC, rawENC) of a smooth random drive whose wheel speeds follow
+    IKV (3,3), integrated like parse.dead_reckon (euler), with camera and wheel noise
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * rate_hz)
+    t = np.arange(n) * (1000.0 / rate_hz)
+    dt = np.diff(t, prepend=t[0]) * 1e-3
+
+    # Body Twist: Low-Pass Filtered Noise (mm/s, rad/s)
+    kernel = np.hanning(2 * rate_hz)
+    body = np.column_stack([np.convolve(rng.normal(0, 1, n), kernel, 'same') for _ in range(3)])
+    body *= np.array([300.0, 300.0, 0.8]) / body.std(axis=0)
+    th = np.cumsum(body[:,2] * dt)
+    th_prev = th - body[:,2] * dt
+    c, s = np.cos(th_prev), np.sin(th_prev)
+    x = np.cumsum((c*body[:,0] - s*body[:,1]) * dt)
+    y = np.cumsum((s*body[:,0] + c*body[:,1]) * dt)
+
+    GFC = np.column_stack([t, x + rng.normal(0, pose_noise[0], n), y + rng.normal(0, pose_noise[0], n),
+                           (th + rng.normal(0, pose_noise[1], n) + np.pi) % (2*np.pi) - np.pi])
+    rawENC = np.column_stack([t, body @ IKV.T + rng.normal(0, wheel_noise, (n, 3))])
+    return GFC, rawENC
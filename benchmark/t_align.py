@@ -0,0 +1,77 @@
+"""
+Benchmark parse.t_align (tick-walking search vs searchsorted interpolation).
+The legacy walk scans the whole encoder timeline per tick (O(n*m)); above
+LEGACY_MAX_ROWS it is timed on the first LEGACY_SAMPLES camera samples against
+the full encoder log and extrapolated linearly to all of them (marked "est.").
+Run from repository root: python -m benchmark.t_align
+"""
+import time
+import numpy as np
+from csv_parse import parse
+from benchmark.synthetic import log_arrays
+
+LEGACY_MAX_ROWS = 100_000
+LEGACY_SAMPLES = 2_000
+
+def legacy_t_align(GFC, rawENC):
+    """tick-walking alignment as shipped before the searchsorted engine"""
+    def read_rawENC_t(t_ms):
+        ind = np.where(rawENC[:,0] == t_ms)
+        if len(ind[0]) > 1:
+            ind = ind[0][0]
+        return rawENC[ind, 1:4].reshape(-1,1)
+
+    aligned_GFC = []
+    aligned_rawENC = []
+    while (GFC[-1,0] > rawENC[-1,0]):
+        GFC = GFC[:-1]
+
+    for i in range(len(GFC)):
+        tc = GFC[i,0]
+        ticks = tc
+        while (ticks <= tc) and (ticks >= 0):
+            xi = read_rawENC_t(ticks)
+            if len(xi) > 0:
+                ti = ticks
+                break
+            ticks -= 1
+        ticks = tc
+        while ticks >= tc and (ticks <= rawENC[-1,0]):
+            xi_next = read_rawENC_t(ticks)
+            if len(xi_next) > 0:
+                ti_next = ticks
+                break
+            ticks += 1
+        if(ti == tc and ti_next == tc):
+            aligned_rawENC.append([tc, xi[0,0], xi[1,0], xi[2,0]])
+        else:
+            xc = xi + (xi_next - xi)*((tc-ti)/(ti_next-ti))
+            aligned_rawENC.append([tc, xc[0,0], xc[1,0], xc[2,0]])
+        aligned_GFC.append([tc, GFC[i,1], GFC[i,2], GFC[i,3]])
+    return np.array(aligned_GFC), np.array(aligned_rawENC)
+
+def new_t_align(GFC, rawENC):
+    log = parse.__new__(parse)
+    log.GFC, log.rawENC = GFC, rawENC
+    log.t_align()
+    return log.GFC, log.rawENC
+
+if __name__ == "__main__":
+    for n in (10_000, 100_000, 1_000_000):
+        GFC, rawENC = log_arrays(n)
+        # Encoder origin at t=0, as written by parse.__init__
+        rawENC[0,0] = 0; GFC = GFC[GFC[:,0] >= 0]
+
+        t0 = time.perf_counter()
+        new_GFC, new_raw = new_t_align(GFC, rawENC)
+        t_new = time.perf_counter() - t0
+
+        # Legacy On All Camera Samples, Or On A Prefix Scaled To All Of Them
+        m = len(GFC) if n <= LEGACY_MAX_ROWS else LEGACY_SAMPLES
+        t0 = time.perf_counter()
+        old_GFC, old_raw = legacy_t_align(GFC[:m], rawENC)
+        t_old = (time.perf_counter() - t0) * len(new_GFC) / len(old_GFC)
+        err = np.max(np.abs(old_raw - new_raw[:len(old_raw)]))
+        label = "legacy" if m == len(GFC) else "legacy est."
+        print(f"{n:>9} rows | {label:>11} {t_old:9.3f} s | new {t_new:7.4f} s | x{t_old/t_new:,.0f} | "
+              f"max diff {err:.2e}" + ("" if m == len(GFC) else f" (legacy timed on {m} of {len(new_GFC)} camera samples)"))
@@ -0,0 +1,216 @@
+############################################
+#     KINEMATIC PARAMETER CALIBRATION      #
+#  Fits omni drive geometry to GFC ground  #
+#  truth by batched least squares on logs  #
+############################################
+
+import os
+import sys
+import time
+import numpy as np
+from os.path import dirname, join
+
+import metrics
+import registry
+from csv_parse import csv, parse
+from include.Utility.utility import Config
+
+# Forward-difference steps of [phi0..2 (rad), L0..2 (mm), scale]
+STEP = np.array([1e-6, 1e-6, 1e-6, 1e-4, 1e-4, 1e-4, 1e-7])
+# Levenberg-Marquardt damping ladder, every value tried in one batch
+DAMPING = (1e-6, 1e-4, 1e-2, 1.0, 1e2)
+
+class Calibration:
+    """
+    Odometry calibration of an omni drive config against GFC ground truth.
+
+    Wheel row i of IKV is [-sin(b+y), cos(b+y), d*cos(y)] / scale, so the
+    geometry is fitted as phi = b+y, L = d*cos(y) per wheel plus one wheel
+    radius scale (rw / rw0). The hand-measured wheel_angle y is kept and
+    axle_angle / axle_length absorb the correction when written back; the
+    scale is written as wheel.pulse_per_mm (and rw), which the kinematics
+    compiler applies, so the saved config reproduces the fitted model.
+
+    Residuals are windowed odometry errors: wheel odometry is restarted from
+    the GFC pose at the start of every window (window ms long) and its motion
+    to the end of the window, in the frame of the start pose, is compared with
+    GFC (heading error weighted by heading_weight mm/rad).
+    """
+    def __init__(self, logs, config_path, window=1000.0, heading_weight=1000.0, cache=True):
+        self.config_path = config_path
+        self.geometry = Calibration.load(config_path)
+        self.x0 = Calibration.pack(self.geometry)
+        self.pulse_per_mm = registry.robot(config_path).kinematics.pulse_per_mm
+        self.heading_weight = heading_weight
+        self.evaluations = 0
+
+        # Concatenate Logs (window pairs never cross a log boundary)
+        wheel, dt, start, end, target = [], [], [], [], []
+        offset = 0
+        for log in logs:
+            if isinstance(log, str):
+                log = parse(log, cache)
+            GFC, rawENC = log.GFC, log.rawENC
+            step = np.diff(rawENC[:,0], prepend=rawENC[0,0]) * 1e-3
+            i, j = metrics.pairs(GFC, window, by="time")
+
+            # Ground Truth Motion In Window Start Frame
+            th = np.unwrap(GFC[:,3])
+            c, s = np.cos(th[i]), np.sin(th[i])
+            dx, dy = GFC[j,1] - GFC[i,1], GFC[j,2] - GFC[i,2]
+            target.append(np.column_stack([c*dx + s*dy, c*dy - s*dx, th[j] - th[i]]))
+
+            wheel.append(rawENC[:,1:4] / self.pulse_per_mm)
+            dt.append(step)
+            start.append(i + offset)
+            end.append(j + offset)
+            offset += len(GFC)
+
+        self.wheel = np.concatenate(wheel)
+        self.dt = np.concatenate(dt)
+        self.i = np.concatenate(start)
+        self.j = np.concatenate(end)
+        self.target = np.concatenate(target)
+        self.target[:,2] *= heading_weight
+
+    @staticmethod
+    def load(config_path):
+        """omni geometry of a drive config as a flat dict (mm / deg, as in the YAML)"""
+        config = Config.load(config_path)
+        geometry = {key: float(value) for section in ("axle_length", "axle_angle", "wheel_angle")
+                    for key, value in config[section].items()}
+        geometry["rw"] = float(config["wheel"]["rw"])
+        return geometry
+
+    @staticmethod
+    def pack(geometry, rw0=None):
+        """geometry dict -> (7,) fit vector [phi0..2, L0..2, scale] (scale of rw against rw0)"""
+        b = np.radians([geometry[f"b{k}"] for k in range(3)])
+        y = np.radians([geometry[f"y{k}"] for k in range(3)])
+        d = np.array([geometry[f"d{k}"] for k in range(3)])
+        return np.concatenate([b + y, d*np.cos(y), [geometry["rw"] / (rw0 or geometry["rw"])]])
+
+    @staticmethod
+    def unpack(x, geometry):
+        """(7,) fit vector -> geometry dict (wheel_angle of geometry kept)"""
+        result = dict(geometry)
+        for k in range(3):
+            y = geometry[f"y{k}"]
+            result[f"b{k}"] = float((np.degrees(x[k]) - y) % 360)
+            result[f"d{k}"] = float(x[3+k] / np.cos(np.radians(y)))
+        result["rw"] = float(geometry["rw"] * x[6])
+        return result
+
+    @staticmethod
+    def matrices(x):
+        """(B,7) fit vectors -> (B,3,3) inverse kinematics matrices IKV"""
+        x = np.atleast_2d(x)
+        phi, L, scale = x[:,:3], x[:,3:6], x[:,6:7]
+        return np.stack([-np.sin(phi), np.cos(phi), L], axis=-1) / scale[:,:,None]
+
+    def residuals(self, x):
+        """(B,7) candidate fit vectors -> (B, 3*pairs) windowed odometry residuals"""
+        x = np.atleast_2d(x)
+        self.evaluations += len(x)
+        KV = np.linalg.inv(Calibration.matrices(x))
+
+        # Body Twist And Relative Heading Of Every Candidate (B,N)
+        body = self.wheel @ KV.transpose(0,2,1)
+        dth = body[...,2] * self.dt
+        C = np.cumsum(dth, axis=1)
+        c, s = np.cos(C - dth), np.sin(C - dth)
+
+        # Euler Steps Rotated By Heading At Step Start, Accumulated
+        vx, vy = body[...,0] * self.dt, body[...,1] * self.dt
+        Sx = np.cumsum(c*vx - s*vy, axis=1)
+        Sy = np.cumsum(s*vx + c*vy, axis=1)
+
+        # Odometry Motion In Window Start Frame (independent of start heading)
+        i, j = self.i, self.j
+        ci, si = np.cos(C[:,i]), np.sin(C[:,i])
+        Dx, Dy = Sx[:,j] - Sx[:,i], Sy[:,j] - Sy[:,i]
+        r = np.stack([ci*Dx + si*Dy - self.target[:,0],
+                      ci*Dy - si*Dx - self.target[:,1],
+                      (C[:,j] - C[:,i]) * self.heading_weight - self.target[:,2]], axis=-1)
+        return r.reshape(len(x), -1)
+
+    def cost(self, x):
+        """(B,7) candidate fit vectors -> (B,) mean squared residual"""
+        return np.mean(self.residuals(x)**2, axis=1)
+
+    def errors(self, x):
+        """RMS window translation (mm) and heading (deg) error of one fit vector"""
+        r = self.residuals(x).reshape(-1, 3)
+        return {"translation_rms": float(np.sqrt(np.mean(r[:,0]**2 + r[:,1]**2))),
+                "heading_rms_deg": float(np.degrees(np.sqrt(np.mean(r[:,2]**2))) / self.heading_weight)}
+
+    def fit(self, iterations=20, tol=1e-6, damping=DAMPING):
+        """
+        Levenberg-Marquardt from the config geometry. Each iteration evaluates
+        the forward-difference Jacobian and every damping step as two batches
+        of candidates. Return the calibrated geometry dict.
+        """
+        x = self.x0.copy()
+        r = self.residuals(x)[0]
+        cost = np.mean(r**2)
+        for _ in range(iterations):
+            # Jacobian (M,7) From All Perturbed Candidates At Once
+            J = ((self.residuals(x + np.diag(STEP)) - r) / STEP[:,None]).T
+            A, g = J.T @ J, J.T @ r
+            steps = np.array([np.linalg.solve(A + lam*np.diag(np.diag(A)), -g) for lam in damping])
+
+            # Try Every Damping In One Batch
+            trial = self.residuals(x + steps)
+            costs = np.mean(trial**2, axis=1)
+            k = np.argmin(costs)
+            if costs[k] >= cost:
+                break
+            converged = cost - costs[k] < tol * cost
+            x, r, cost = x + steps[k], trial[k], costs[k]
+            if converged:
+                break
+        self.x = x
+        return Calibration.unpack(x, self.geometry)
+
+    def save(self, out_path, geometry):
+        """write the drive config with geometry replaced (and fit errors recorded) to out_path"""
+        import yaml
+        with open(join(dirname(__file__), self.config_path), 'r') as file:
+            config = yaml.safe_load(file)
+        for section in ("axle_length", "axle_angle", "wheel_angle"):
+            for key in config[section]:
+                config[section][key] = geometry[key]
+
+        # Wheel Radius Scale Applied Through Encoder Pulses Per mm
+        config["wheel"]["rw"] = geometry["rw"]
+        config["wheel"]["pulse_per_mm"] = self.pulse_per_mm * self.geometry["rw"] / geometry["rw"]
+
+        x = Calibration.pack(geometry, self.geometry["rw"])
+        before, after = self.errors(self.x0), self.errors(x)
+        config["calibration"] = {"samples": int(len(self.wheel)),
+                                 "windows": int(len(self.i)),
+                                 "translation_rms": [round(before["translation_rms"], 3), round(after["translation_rms"], 3)],
+                                 "heading_rms_deg": [round(before["heading_rms_deg"], 4), round(after["heading_rms_deg"], 4)]}
+        with open(out_path, 'w') as file:
+            yaml.safe_dump(config, file, sort_keys=False)
+
+# Calibration Entry Point: python calibration.py <drive config> <output yaml> <log or dir>...
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        sys.exit("usage: python calibration.py <drive config> <output yaml> <log or dir>...")
+    files = []
+    for path in sys.argv[3:]:
+        files += sorted(csv.get_files_from_path(path)) if os.path.isdir(path) else [path]
+
+    t0 = time.perf_counter()
+    calibration = Calibration(files, sys.argv[1])
+    geometry = calibration.fit()
+    calibration.save(sys.argv[2], geometry)
+    elapsed = time.perf_counter() - t0
+
+    before, after = calibration.errors(calibration.x0), calibration.errors(calibration.x)
+    print(f"{len(files)} logs, {len(calibration.wheel)} samples, {calibration.evaluations} candidates in {elapsed:.1f} s")
+    for key in before:
+        print(f"{key:>16} | {before[key]:10.4f} -> {after[key]:10.4f}")
+    for key in geometry:
+        print(f"{key:>16} | {calibration.geometry[key]:10.4f} -> {geometry[key]:10.4f}")
@@ -0,0 +1,67 @@
+import numpy as np
+
+class Camera:
+    """
+    2D view of the world with zoom, pan and rotation. World (x, y) maps to screen
+    pixels through one 3x3 homogeneous matrix, applied to whole (..., 2) point
+    batches at once. The world point at center is shown at the viewport center.
+    """
+    def __init__(self, viewport, scale=1.0, center=None, rotation=0.0, min_scale=1e-3, max_scale=1e3):
+        # Viewport (left, top, width, height) in screen pixels
+        self.viewport = viewport
+        self.viewCenter = np.array([viewport[0] + viewport[2] * 0.5, viewport[1] + viewport[3] * 0.5])
+        self.scale = scale
+        self.center = self.viewCenter.copy() if center is None else np.array(center, dtype=np.float64)
+        self.rotation = rotation
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.update()
+
+    def update(self):
+        """recompute world -> screen matrix after a view change"""
+        c, s = np.cos(self.rotation), np.sin(self.rotation)
+        A = self.scale * np.array([[c, -s], [s, c]])
+        self.M = np.eye(3)
+        self.M[:2,:2] = A
+        self.M[:2,2] = self.viewCenter - A @ self.center
+        self._Minv = np.linalg.inv(self.M)
+
+    def apply(self, points):
+        """world -> screen for (..., 2) points"""
+        return points @ self.M[:2,:2].T + self.M[:2,2]
+
+    def inverse(self, points):
+        """screen -> world for (..., 2) points"""
+        return points @ self._Minv[:2,:2].T + self._Minv[:2,2]
+
+    def zoom(self, factor, anchor=None):
+        """scale view by factor, keeping the world point under screen anchor fixed"""
+        anchor = self.viewCenter if anchor is None else np.asarray(anchor, dtype=np.float64)
+        world = self.inverse(anchor)
+        self.scale = min(max(self.scale * factor, self.min_scale), self.max_scale)
+        self.update()
+        self.center += world - self.inverse(anchor)
+        self.update()
+
+    def pan(self, dx, dy):
+        """move view by (dx, dy) screen pixels"""
+        self.center -= self._Minv[:2,:2] @ np.array([dx, dy], dtype=np.float64)
+        self.update()
+
+    def rotate(self, angle):
+        self.rotation += angle
+        self.update()
+
+    def world_bounds(self):
+        """axis-aligned world box (xmin, ymin, xmax, ymax) covering the viewport"""
+        left, top, width, height = self.viewport
+        corners = self.inverse(np.array([[left, top], [left + width, top], [left + width, top + height], [left, top + height]], dtype=np.float64))
+        return (*corners.min(axis=0), *corners.max(axis=0))
+
+    def visible(self, centers, radius):
+        """mask of (N,2) world centers whose radius-disc can reach the viewport"""
+        left, top, width, height = self.viewport
+        r = radius * self.scale
+        screen = self.apply(centers)
+        return ((screen[:,0] > left - r) & (screen[:,0] < left + width + r) &
+                (screen[:,1] > top - r) & (screen[:,1] < top + height + r))
@@ -0,0 +1,198 @@
+import numpy as np
+import registry
+from include.Utility.utility import Utility
+from occupancy import OccupancyGrid
+
+# Elements Per Vectorized Chunk Of The Distance Transform
+EDT_CHUNK = 1 << 16
+
+def column_distance(blocked):
+    """(rows, cols) int32 distance along each column to the nearest blocked cell (rows + cols if there is none)"""
+    R, C = blocked.shape
+    far = R + C
+    out = np.empty((R, C), dtype=np.int32)
+    r = np.arange(R, dtype=np.int32)[:, None]
+    step = max(1, EDT_CHUNK // R)
+    for c in range(0, C, step):
+        b = blocked[:, c:c+step]
+        # Nearest Blocked Row Above And Below (running max / min of blocked row indices)
+        above = np.maximum.accumulate(np.where(b, r, -far), axis=0)
+        below = np.minimum.accumulate(np.where(b, r, R + far)[::-1], axis=0)[::-1]
+        out[:, c:c+step] = np.minimum(np.minimum(r - above, below - r), far)
+    return out
+
+def envelope(f):
+    """
+    min over q of f[:,q] + (p-q)^2 for every p, row-wise. The leftmost minimizing q
+    is non-decreasing in p, so positions are solved coarse to fine, each searching
+    only between the minimizers of its solved neighbours: O(n log n) per row, every
+    level one flat vectorized segment-min over all rows.
+    """
+    R, n = f.shape
+    out = np.empty((R, n), dtype=np.int64)
+    arg = np.empty((R, n), dtype=np.int64)
+    q = np.arange(n, dtype=np.int64)
+    flat = f.ravel()
+
+    # Position 0 Scans Every q
+    arg[:,0] = np.argmin(f + q*q, axis=1)
+    out[:,0] = f[np.arange(R), arg[:,0]] + arg[:,0]**2
+
+    h = 1 << (n - 1).bit_length() - 1 if n > 1 else 0
+    while h >= 1:
+        p = np.arange(h, n, 2*h)
+        lo = arg[:, p - h]
+        hi = np.where(p + h < n, arg[:, np.minimum(p + h, n - 1)], n - 1)
+        length = (hi - lo + 1).ravel()
+
+        # Candidates Of Every (row, position) Segment Concatenated: flat index and d = p - q
+        start = np.cumsum(length) - length
+        i = np.arange(start[-1] + length[-1])
+        index = np.repeat((np.arange(R)[:,None] * n + lo).ravel() - start, length) + i
+        d = np.repeat((p + (start.reshape(R, -1) - lo)).ravel(), length) - i
+
+        # Segment Min Of value * 2n + (n - d) Gives Min Value And Leftmost Minimizer
+        key = flat[index]
+        key += d*d
+        key *= 2*n
+        key += n - d
+        best = np.minimum.reduceat(key, start).reshape(R, len(p))
+        out[:, p] = best // (2*n)
+        arg[:, p] = p - (n - best % (2*n))
+        h //= 2
+    return out
+
+def distance_transform(blocked):
+    """exact euclidean distance (in cells, float32) from every cell to the nearest blocked cell"""
+    # Column Pass, Then Row Pass Written Over The Same Buffer In Row Chunks
+    g = column_distance(blocked)
+    out = g.view(np.float32)
+    step = max(1, EDT_CHUNK // blocked.shape[1])
+    for r in range(0, blocked.shape[0], step):
+        f = g[r:r+step].astype(np.int64)**2
+        out[r:r+step] = np.sqrt(envelope(f))
+    return out
+
+class FootprintCollision:
+    """
+    Collision checks of a robot footprint (convex polygons in the robot frame)
+    against an OccupancyGrid. The cells covered by the footprint are precomputed
+    per quantized heading, so a batch of poses is one gather from the grid. An
+    optional distance transform gives O(1) clearance per pose and skips the cell
+    check for poses that are clear of every obstacle.
+    """
+    def __init__(self, grid, polygons, headings=72, occupied_thresh=50, unknown_is_obstacle=True, precompute=True):
+        self.grid = grid
+        self.polygons = np.asarray(polygons, dtype=np.float64)
+        self.headings = headings
+        self.radius = np.max(np.linalg.norm(self.polygons, axis=-1))
+
+        # Cell Value -> Blocked
+        self.blocked = np.zeros(256, dtype=bool)
+        self.blocked[occupied_thresh:OccupancyGrid.UNKNOWN] = True
+        self.blocked[OccupancyGrid.UNKNOWN] = unknown_is_obstacle
+        self.unknown_is_obstacle = unknown_is_obstacle
+
+        self.offsets = self.footprint_cells(self.polygons, grid.resolution, headings)
+        self._distance = None
+        self._distanceVersion = None
+        if precompute:
+            self.distance()
+
+    @staticmethod
+    def from_config(grid, robot_config, **kwargs):
+        """footprint (body + wheels) of a drive config as drawn by RobotOmni"""
+        robot = registry.robot(robot_config)
+        return FootprintCollision(grid, np.concatenate([robot.body[None], robot.wheels]), **kwargs)
+
+    @staticmethod
+    def sample(polygons, spacing):
+        """points filling (P,V,2) convex polygons (interior lattice plus edges) at spacing"""
+        # Interior Lattice Points Inside Any Polygon
+        extent = np.max(np.abs(polygons))
+        axis = np.arange(-extent, extent + spacing, spacing)
+        lattice = np.stack(np.meshgrid(axis, axis), axis=-1).reshape(-1, 2)
+        edges = np.roll(polygons, -1, axis=1) - polygons
+        rel = lattice[:, None, None, :] - polygons[None]
+        cross = edges[None,...,0] * rel[...,1] - edges[None,...,1] * rel[...,0]
+        inside = (np.all(cross >= 0, axis=2) | np.all(cross <= 0, axis=2)).any(axis=1)
+
+        # Edge Points So Thin Polygons Are Never Missed
+        count = int(np.ceil(np.max(np.linalg.norm(edges, axis=-1)) / spacing)) + 1
+        u = np.linspace(0, 1, count)[:, None, None, None]
+        outline = (polygons[None] + u * edges[None]).reshape(-1, 2)
+        return np.vstack([lattice[inside], outline])
+
+    @staticmethod
+    def footprint_cells(polygons, resolution, headings):
+        """(headings, K, 2) (row, col) offsets covered for any center position in its cell and heading in its bin"""
+        points = FootprintCollision.sample(polygons, resolution * 0.5)
+        width = 2 * np.pi / headings
+        shifts = np.array([[0, 0], [0, 1], [1, 0], [1, 1]]) * (resolution * (1 - 1e-9))
+
+        # Covered Cells Marked On A Mask Around The Center Cell
+        B = int(np.ceil(np.max(np.linalg.norm(points, axis=1)) / resolution)) + 1
+        cells = []
+        for h in range(headings):
+            covered = np.zeros((2*B + 1, 2*B + 1), dtype=bool)
+            for th in (h - 0.5, h, h + 0.5):
+                rotated = Utility.transform_2D(points, (0.0, 0.0, th * width))
+                for shift in shifts:
+                    rc = np.floor((rotated + shift) / resolution)[:, ::-1].astype(np.int64) + B
+                    covered[rc[:,0], rc[:,1]] = True
+            cells.append(np.argwhere(covered) - B)
+
+        # Pad To Equal Length By Repeating A Cell
+        K = max(len(c) for c in cells)
+        return np.stack([np.vstack([c, np.repeat(c[:1], K - len(c), axis=0)]) for c in cells])
+
+    def distance(self):
+        """distance transform (cells) of the blocked cells, recomputed after grid edits"""
+        if self._distance is None or self._distanceVersion != self.grid.version:
+            blocked = self.blocked[self.grid.cells]
+            if self.unknown_is_obstacle:
+                # Outside The Grid Is Unknown, So The Border Counts As Blocked
+                blocked = np.pad(blocked, 1, constant_values=True)
+                self._distance = distance_transform(blocked)[1:-1, 1:-1]
+            else:
+                self._distance = distance_transform(blocked)
+            self._distanceVersion = self.grid.version
+        return self._distance
+
+    def clearance(self, poses):
+        """conservative footprint clearance (world units) at (..., 3) poses, <= 0 may collide"""
+        distance = self.distance()
+        rc = self.grid.world_to_cell(poses[..., :2])
+        inside = (rc[..., 0] >= 0) & (rc[..., 0] < self.grid.height) & (rc[..., 1] >= 0) & (rc[..., 1] < self.grid.width)
+        out = np.full(rc.shape[:-1], np.inf if not self.unknown_is_obstacle else -self.radius)
+        # Center To Nearest Obstacle Point, Minus Cell Quantization And Footprint Radius
+        out[inside] = (distance[rc[inside][:,0], rc[inside][:,1]] - np.sqrt(2)) * self.grid.resolution - self.radius
+        return out
+
+    def collides(self, poses, chunk=4096):
+        """bool mask of (..., 3) poses whose footprint touches a blocked cell"""
+        flat = np.asarray(poses, dtype=np.float64).reshape(-1, 3)
+        out = np.zeros(len(flat), dtype=bool)
+
+        # Only Poses Near An Obstacle Need The Cell Check
+        check = np.arange(len(flat))
+        if self._distance is not None:
+            check = check[self.clearance(flat) <= 0]
+
+        for start in range(0, len(check), chunk):
+            index = check[start:start+chunk]
+            center = self.grid.world_to_cell(flat[index, :2])
+            heading = np.round(flat[index, 2] / (2 * np.pi / self.headings)).astype(np.int64) % self.headings
+            cells = center[:, None, :] + self.offsets[heading]
+            inside = (cells[...,0] >= 0) & (cells[...,0] < self.grid.height) & (cells[...,1] >= 0) & (cells[...,1] < self.grid.width)
+            blocked = np.full(inside.shape, self.unknown_is_obstacle)
+            blocked[inside] = self.blocked[self.grid.cells[cells[inside][:,0], cells[inside][:,1]]]
+            out[index] = blocked.any(axis=1)
+        return out.reshape(np.shape(poses)[:-1])
+
+    def validate(self, poses, t=None):
+        """first collision time along the last pose axis (NaN if none) and per-pose clearance"""
+        hit = self.collides(poses)
+        t = np.arange(hit.shape[-1]) if t is None else np.asarray(t)
+        first = np.where(hit.any(axis=-1), t[np.argmax(hit, axis=-1)], np.nan)
+        return first, self.clearance(poses)
@@ -1,6 +1,83 @@
 import os
+import itertools
 import numpy as np
+import registry
 from kinematics import kinematics
+from include.Utility.utility import Cache
+
+class TimeIndex:
+    """
+    Sorted timestamp index of a (t, ...) stream for O(log N) time lookups.
+    Duplicate timestamps keep their first row.
+    """
+    def __init__(self, data):
+        order = np.argsort(data[:,0], kind='stable')
+        data = data[order]
+        self.t, first = np.unique(data[:,0], return_index=True)
+        self.rows = data[first, 1:]
+
+    def find(self, t_ms, mode="exact"):
+        """return row index of each query time (-1 if not available)"""
+        tq = np.atleast_1d(np.asarray(t_ms, dtype=np.float64))
+        n = len(self.t)
+        if mode == "previous":
+            ind = np.searchsorted(self.t, tq, side='right') - 1
+        elif mode == "next":
+            ind = np.searchsorted(self.t, tq, side='left')
+            ind[ind >= n] = -1
+        elif mode == "exact":
+            ind = np.minimum(np.searchsorted(self.t, tq, side='left'), n-1)
+            ind[self.t[ind] != tq] = -1
+        elif mode == "nearest":
+            right = np.minimum(np.searchsorted(self.t, tq, side='left'), n-1)
+            left = np.maximum(right-1, 0)
+            ind = np.where(tq - self.t[left] <= self.t[right] - tq, left, right)
+        else:
+            raise ValueError(f"unknown lookup mode: {mode}")
+        return ind
+
+    def interp(self, t_ms):
+        """linear interpolation of rows onto query times (linear extrapolation outside t)"""
+        tq = np.atleast_1d(np.asarray(t_ms, dtype=np.float64))
+        if len(self.t) == 1:
+            return np.repeat(self.rows, len(tq), axis=0)
+        
+        # Bracket Each Query (t[i] <= tq < t[i+1])
+        i = np.clip(np.searchsorted(self.t, tq, side='right') - 1, 0, len(self.t)-2)
+        w = ((tq - self.t[i]) / (self.t[i+1] - self.t[i]))[:,None]
+        return self.rows[i] + (self.rows[i+1] - self.rows[i]) * w
+
+    def lookup(self, t_ms, mode="exact"):
+        """return rows at query times in one batch (NaN if not available)"""
+        tq = np.atleast_1d(np.asarray(t_ms, dtype=np.float64))
+        if mode == "interp":
+            rows = self.interp(tq)
+            rows[(tq < self.t[0]) | (tq > self.t[-1])] = np.nan
+        else:
+            ind = self.find(tq, mode)
+            rows = self.rows[ind]
+            rows[ind < 0] = np.nan
+        return rows
+
+class GrowArray:
+    """Preallocated float64 row buffer that doubles its capacity when full"""
+    def __init__(self, cols, capacity=1024):
+        self._buf = np.empty((capacity, cols))
+        self.n = 0
+
+    def append(self, rows):
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, self._buf.shape[1])
+        need = self.n + len(rows)
+        if need > len(self._buf):
+            buf = np.empty((max(need, 2*len(self._buf)), self._buf.shape[1]))
+            buf[:self.n] = self._buf[:self.n]
+            self._buf = buf
+        self._buf[self.n:need] = rows
+        self.n = need
+
+    @property
+    def data(self):
+        return self._buf[:self.n]
 
 class csv():
     @staticmethod
@@ -27,6 +104,45 @@ class csv():
 
         return result
             
+    # Record Type Codes (column 0 of telemetry logs)
+    RECORD_TYPE = {"real_gfc": 0, "real_encoder": 1, "raw_encoder": 2}
+    
+    @staticmethod
+    def load_log(filename, delim = ";", skiprows = 1):
+        """
+        load a telemetry log (file name or iterable of lines) as record type codes and float64 [t, x, y, th] columns in one pass,
+        raising ValueError (prefixed with the file name) on a malformed line
+        """
+        try:
+            result = np.loadtxt(filename, delimiter=delim, skiprows=skiprows, usecols=(0,2,8,9,10), ndmin=2,
+                                converters={0: lambda s: csv.RECORD_TYPE.get(s.strip(), -1)})
+        except ValueError as e:
+            if not isinstance(filename, str):
+                raise
+            raise ValueError(f"{filename}: {e}") from e
+        
+        return result[:,0].astype(np.int8), result[:,1:]
+    
+    @staticmethod
+    def iter_log(filename: str, chunk_rows = 100_000, delim = ";", skiprows = 1):
+        """
+        yield (record type codes, [t, x, y, th] columns) of a telemetry log in chunks of chunk_rows lines,
+        raising ValueError (file name and line range of the chunk) on a malformed line
+        """
+        with open(filename) as infile:
+            for _ in range(skiprows): next(infile, None)
+            start = skiprows + 1
+            while True:
+                lines = list(itertools.islice(infile, chunk_rows))
+                if not lines:
+                    return
+                try:
+                    chunk = csv.load_log(lines, delim, skiprows=0)
+                except ValueError as e:
+                    raise ValueError(f"{filename} (lines {start}-{start + len(lines) - 1}): {e}") from e
+                start += len(lines)
+                yield chunk
+    
     @staticmethod
     def load_all(path: str) -> dict:
         """loads all CSV files into a dict"""
@@ -38,48 +154,52 @@ class csv():
         return result
 
 class parse(csv):
-    def __init__(self, filename: str):
-        # Load data from CSV
-        self.result = csv.load_csv(filename)
-        self.GFC = None
-        self.ENC = None
-        self.rawENC = None
-        
-        # Split the data (ENC and GFC)
-        ENC = []
-        GFC = []
-        rawENC = []
-        
-        for k in range(1,len(self.result)):
-            # Get Timeline Correct
-            time = np.float64(self.result[k,2]) - np.float64(self.result[1,2])
-            if self.result[k,0] == 'real_gfc':
-                # Normalize Theta
-                th = np.radians(np.float32(self.result[k,10]))
-                while(th>np.pi and th<-np.pi):
-                    if th > np.pi : th -= 2*np.pi
-                    elif th < np.pi : th += 2*np.pi
-                # Append GFC array
-                GFC.append([time, np.float64(self.result[k,8]), np.float64(self.result[k,9]), th])
-                
-                # Also Append ENC Origin
-                if (k == 1):
-                    rawENC.append([time, 0, 0, 0])
-                    ENC.append([time, np.float64(self.result[k,8]), np.float64(self.result[k,9]), np.radians(np.float64(self.result[k,10]))])
-
-            elif self.result[k,0] == 'real_encoder':
-                ENC.append([time, np.float64(self.result[k,8]), np.float64(self.result[k,9]), np.radians(np.float64(self.result[k,10]))])
-            
-            elif self.result[k,0] == 'raw_encoder':
-                rawENC.append([time, np.float64(self.result[k,8]), np.float64(self.result[k,9]), np.float64(self.result[k,10])])
+    @staticmethod
+    def split(kind, data, t0=None, origin=True):
+        """split log columns into GFC, ENC, rawENC arrays by record type mask"""
+        # Get Timeline Correct
+        if t0 is None: t0 = data[0,0]
+        t = data[:,0] - t0
         
-        # Convert to NumPy
-        self.GFC = np.array(GFC)
-        self.ENC = np.array(ENC)
-        self.rawENC = np.array(rawENC)
+        # Record Type Masks
+        isGFC = kind == csv.RECORD_TYPE["real_gfc"]
+        isENC = kind == csv.RECORD_TYPE["real_encoder"]
+        isRaw = kind == csv.RECORD_TYPE["raw_encoder"]
         
-        # Align Timeframe
-        self.t_align()
+        GFC = np.column_stack([t[isGFC], data[isGFC,1], data[isGFC,2], np.radians(data[isGFC,3].astype(np.float32))])
+        ENC = np.column_stack([t[isENC], data[isENC,1], data[isENC,2], np.radians(data[isENC,3])])
+        rawENC = np.column_stack([t[isRaw], data[isRaw,1:4]])
+        
+        # Also Append ENC Origin (log starting on camera pose)
+        if origin and len(kind) > 0 and isGFC[0]:
+            ENC = np.vstack([[t[0], data[0,1], data[0,2], np.radians(data[0,3])], ENC])
+            rawENC = np.vstack([[t[0], 0, 0, 0], rawENC])
+        return GFC, ENC, rawENC
+    
+    # Bump when parsed/aligned output changes to invalidate cached logs
+    VERSION = 1
+    
+    def __init__(self, filename: str, cache = True):
+        # Load parsed log from binary cache
+        arrays = Cache.load(filename, parse.VERSION, ("GFC", "ENC", "rawENC")) if cache else None
+        if arrays is not None:
+            self.GFC, self.ENC, self.rawENC = arrays["GFC"], arrays["ENC"], arrays["rawENC"]
+        else:
+            # Load data from CSV (record type + numeric columns only)
+            kind, data = csv.load_log(filename)
+            
+            # Split the data (ENC and GFC)
+            self.GFC, self.ENC, self.rawENC = parse.split(kind, data)
+            
+            # Align Timeframe
+            self.t_align()
+            if cache:
+                Cache.save(filename, parse.VERSION, {"GFC": self.GFC, "ENC": self.ENC, "rawENC": self.rawENC})
+        
+        # Build Timestamp Index
+        self.index = {"GFC": TimeIndex(self.GFC),
+                      "ENC": TimeIndex(self.ENC),
+                      "rawENC": TimeIndex(self.rawENC)}
         
     def get_GFC(self):
         return self.GFC
@@ -90,133 +210,226 @@ class parse(csv):
     def get_rawENC(self):
         return self.rawENC
     
+    @staticmethod
+    def get_kinematics(config_path):
+        """shared kinematics model of a drive config path (an already built model is passed through)"""
+        return config_path if isinstance(config_path, kinematics) else registry.robot(config_path).kinematics
+    
     def get_ENCtoRaw(self, config_path):
-        output = []
-        Kinematics = kinematics(config_path)
-        
-        for k in range(len(self.ENC)-1):
-            delta = self.ENC[k+1] - self.ENC[k]
-            # Get Instanteous Velocity
-            v = np.array([[delta[1]/(delta[0]*1e-3)],
-                          [delta[2]/(delta[0]*1e-3)],
-                          [(delta[3])/(delta[0]*1e-3)]])
-            
-            # Transform To Encoder Frame
-            enc_frame = Kinematics.rotation("local", v, self.GFC[0,3])
-            
-            # Compute Angular Wheel Velocity
-            result = Kinematics.inverse(Kinematics.rotation("local", enc_frame, (self.ENC[k,3]-self.GFC[0,3])))
-            output.append([self.ENC[k,0], np.float32(result[0,0]), np.float32(result[1,0]), np.float32(result[2,0])])
-        self.ENCtoRaw = np.array(output)
-        return self.ENCtoRaw
-
-    def get_RawtoENC(self, config_path):
-        prev_th = 0
-        output  = []
-        output.append([np.float64(self.GFC[0,0]), np.float64(self.GFC[0,1]), np.float64(self.GFC[0,2]), np.float64(self.GFC[0,3])])
+        Kinematics = parse.get_kinematics(config_path)
         
-        result = np.array([[0.0], [0.0], [0.0]])
+        # Get Instanteous Velocity
+        delta = np.diff(self.ENC, axis=0)
+        v = delta[:,1:4] / (delta[:,0:1]*1e-3)
         
+        # Transform To Encoder Frame (GFC origin + relative heading = ENC heading)
+        # and Compute Angular Wheel Velocity
+        result = Kinematics.inverse_batch(v, self.ENC[:-1,3]).astype(np.float32)
+        self.ENCtoRaw = np.column_stack([self.ENC[:-1,0], result])
+        self.index["ENCtoRaw"] = TimeIndex(self.ENCtoRaw)
+        return self.ENCtoRaw
+
+    def get_RawtoENC(self, config_path, method="euler"):
         # Get Kinematics Config
-        Kinematics = kinematics(config_path)
+        Kinematics = parse.get_kinematics(config_path)
         
-        # Start Integrating
-        for k in range(1, len(self.rawENC)):
-            # Get Time
-            dt = (self.rawENC[k,0] - self.rawENC[k-1,0]) * 1e-3
-            
-            # Get Instanteous Velocity
-            w = np.array([[self.rawENC[k,1]],
-                          [self.rawENC[k,2]],
-                          [self.rawENC[k,3]]])
-            
-            # Convert to Encoder World Frame
-            body_frame = Kinematics.rotation("global", Kinematics.rotation("global", Kinematics.forward(w), prev_th), self.GFC[0,3])
-            
-            # Update Position
-            result += (body_frame * dt)
-            
-            # Normalize Theta
-            if result[2,0] > np.pi : result[2,0] -= 2*np.pi
-            elif result[2,0] < -np.pi : result[2,0] += 2*np.pi
-            
-            # Update Theta
-            prev_th = result[2,0]
-            
-            # Append List
-            output.append([self.rawENC[k,0], np.float64(result[0,0]), np.float64(result[1,0]), np.float64(result[2,0]+self.GFC[0,3])])
-        self.RawtoENC = np.array(output)
+        # Start Integrating From Camera Start Pose (same world frame as GFC)
+        state = np.array([self.rawENC[0,0], self.GFC[0,1], self.GFC[0,2], 0.0])
+        output, _ = parse.dead_reckon(Kinematics, self.rawENC[1:], self.GFC[0,3], state, method)
+        self.RawtoENC = np.vstack([self.GFC[0], output])
+        self.index["RawtoENC"] = TimeIndex(self.RawtoENC)
         return self.RawtoENC
     
+    @staticmethod
+    def dead_reckon(Kinematics, rawENC, th0, state, method="euler"):
+        """
+        Integrate wheel odometry rows [t, w1, w2, w3] starting from state [t, x, y, th]
+        (th relative to heading th0). Return [t, x, y, th+th0] rows and the final state.
+        Method "euler" rotates each step by the heading at its start, "midpoint" (RK2)
+        by the heading halfway through the step.
+        """
+        if len(rawENC) == 0:
+            return np.empty((0,4)), state
+        
+        # Get Time
+        dt = np.diff(rawENC[:,0], prepend=state[0]) * 1e-3
+        
+        # Body Twist and Heading (cumulative sum of angular rate)
+        body = Kinematics.forward_batch(rawENC[:,1:4])
+        th = state[3] + np.cumsum(body[:,2] * dt)
+        th_prev = np.concatenate([[state[3]], th[:-1]])
+        if method == "euler":
+            th_step = th_prev
+        elif method == "midpoint":
+            th_step = th_prev + 0.5 * body[:,2] * dt
+        else:
+            raise ValueError(f"unknown integration method: {method}")
+        
+        # Convert to Encoder World Frame and Update Position
+        world = Kinematics.rotation_batch("global", body, th_step + th0)
+        x = state[1] + np.cumsum(world[:,0] * dt)
+        y = state[2] + np.cumsum(world[:,1] * dt)
+        
+        # Normalize Theta
+        th = (th + np.pi) % (2*np.pi) - np.pi
+        
+        output = np.column_stack([rawENC[:,0], x, y, th + th0])
+        return output, np.array([rawENC[-1,0], x[-1], y[-1], th[-1]])
+    
     def t_align(self):
         # ------------- Data Delta T Alignment ------------- # 
-        # Iteration Update
-        ticks = 0
-        aligned_GFC = []
-        aligned_rawENC = []
+        # Encoder Timeline (sorted, duplicate timestamps keep first sample)
+        rawENC_index = TimeIndex(self.rawENC)
         
-        # Data Trim
-        while (self.GFC[-1,0] > self.rawENC[-1,0]):
-            self.GFC = self.GFC[:-1]
+        # Data Trim (camera samples outside encoder timeline can't be interpolated)
+        tc = self.GFC[:,0]
+        self.GFC = self.GFC[(tc >= rawENC_index.t[0]) & (tc <= rawENC_index.t[-1])]
         
         # Odometry Alignment
-        for i in range(len(self.GFC)):
-            # Set time to be relative with camera
-            tc = self.GFC[i,0]
-            ticks = tc
-            
-            # Search Prev Time
-            while (ticks <= tc) and (ticks >= 0):
-                # Define Time Sampling
-                xi = self.read_rawENC_t(ticks)
-                if len(xi) > 0:
-                    ti = ticks
-                    break
-                ticks -= 1
-            
-            # Search Next Time
-            ticks = tc
-            while ticks >= tc  and (ticks <= self.rawENC[-1,0]):
-                # Define Time Sampling
-                xi_next = self.read_rawENC_t(ticks)
-                if len(xi_next) > 0:
-                    ti_next = ticks
-                    break
-                ticks += 1
-            
-            # Get Aligned Odometry Encoder
-            if(ti == tc and ti_next == tc): 
-                aligned_rawENC.append([tc, xi[0,0], xi[1,0], xi[2,0]])
-            else: 
-                xc = xi + (xi_next - xi)*((tc-ti)/(ti_next-ti))
-                aligned_rawENC.append([tc, xc[0,0], xc[1,0], xc[2,0]])
-            
-            # Append GFC Pose
-            aligned_GFC.append([tc, self.GFC[i,1], self.GFC[i,2], self.GFC[i,3]])
-            
+        aligned_rawENC = np.empty_like(self.GFC)
+        aligned_rawENC[:,0] = self.GFC[:,0]
+        aligned_rawENC[:,1:4] = rawENC_index.interp(self.GFC[:,0])
+        
         # replace old vars
-        self.GFC = np.array(aligned_GFC)
-        self.rawENC = np.array(aligned_rawENC)
+        self.rawENC = aligned_rawENC
+    
+    def read_t(self, stream: str, t_ms, mode="exact"):
+        """
+        Read stream ("GFC", "ENC", "rawENC", "ENCtoRaw", "RawtoENC") rows at t_ms.
+        Scalar t_ms returns a (3,1) column (empty if not available),
+        array t_ms returns (N,3) rows in one call (NaN where not available).
+        Mode is one of "exact", "nearest", "previous", "next" or "interp".
+        """
+        rows = self.index[stream].lookup(t_ms, mode)
+        if np.ndim(t_ms) == 0:
+            return rows[~np.isnan(rows).any(axis=1)].reshape(-1,1)
+        return rows
     
-    def read_GFC_t(self, t_ms):
-        ind = np.where(self.GFC[:,0] == t_ms)
-        return self.GFC[ind, 1:4].reshape(-1,1)
+    def read_GFC_t(self, t_ms, mode="exact"):
+        return self.read_t("GFC", t_ms, mode)
 
-    def read_ENCtoRaw_t(self, t_ms):
-        ind = np.where(self.ENCtoRaw[:,0] == t_ms)
-        return self.ENCtoRaw[ind, 1:4].reshape(-1,1) 
+    def read_ENCtoRaw_t(self, t_ms, mode="exact"):
+        return self.read_t("ENCtoRaw", t_ms, mode)
 
-    def read_RawtoENC_t(self, t_ms):
-        ind = np.where(self.RawtoENC[:,0] == t_ms)
-        return self.RawtoENC[ind, 1:4].reshape(-1,1) 
-    
-    def read_rawENC_t(self, t_ms):
-        ind = np.where(self.rawENC[:,0] == t_ms)
-        # Choose first data if duplicate available
-        if len(ind[0]) > 1:
-            ind = ind[0][0]
-        return self.rawENC[ind, 1:4].reshape(-1,1) 
-        
-    def read_ENC_t(self, t_ms):
-        ind = np.where(self.ENC[:,0] == t_ms)
-        return self.ENC[ind, 1:4].reshape(-1,1) 
+    def read_RawtoENC_t(self, t_ms, mode="exact"):
+        return self.read_t("RawtoENC", t_ms, mode)
+    
+    def read_rawENC_t(self, t_ms, mode="exact"):
+        return self.read_t("rawENC", t_ms, mode)
+        
+    def read_ENC_t(self, t_ms, mode="exact"):
+        return self.read_t("ENC", t_ms, mode)
+
+class parse_stream(parse):
+    """
+    Streaming variant of parse. The log is read in chunks of chunk_rows lines and
+    GFC/ENC/rawENC, timeline alignment and (with config_path) RawtoENC dead-reckoning
+    are extended as each chunk arrives. Assumes the log is written in time order.
+    """
+    def __init__(self, filename: str, config_path=None, chunk_rows=100_000, method="euler"):
+        self.chunks = csv.iter_log(filename, chunk_rows)
+        self.Kinematics = parse.get_kinematics(config_path) if config_path is not None else None
+        self.method = method
+        self.t0 = None
+        self.index = {}
+        
+        # Output Buffers
+        self._GFC = GrowArray(4)
+        self._ENC = GrowArray(4)
+        self._rawENC = GrowArray(4)
+        self._RawtoENC = GrowArray(4)
+        
+        # Samples Waiting For Alignment
+        self._GFCTail = np.empty((0,4))
+        self._rawTail = np.empty((0,4))
+        self._tAligned = -np.inf
+        self._state = None
+        self._nReckoned = 0
+        self.publish()
+    
+    def __iter__(self):
+        """process the log chunk by chunk, yielding self after each chunk"""
+        while self.update():
+            yield self
+    
+    def run(self):
+        """process the whole log and build the timestamp index"""
+        for _ in self: pass
+        self.index = {"GFC": TimeIndex(self.GFC),
+                      "ENC": TimeIndex(self.ENC),
+                      "rawENC": TimeIndex(self.rawENC)}
+        if self.Kinematics is not None:
+            self.index["RawtoENC"] = TimeIndex(self.RawtoENC)
+        return self
+    
+    def update(self) -> bool:
+        """read and process the next chunk, return False once the log is exhausted (a malformed line raises ValueError)"""
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        kind, data = chunk
+        if len(kind) == 0:
+            return True
+        
+        # Split Chunk (ENC origin only on the first chunk)
+        first = self.t0 is None
+        if first: self.t0 = data[0,0]
+        GFC, ENC, rawENC = parse.split(kind, data, self.t0, origin=first)
+        self._ENC.append(ENC)
+        self._GFCTail = np.vstack([self._GFCTail, GFC])
+        self._rawTail = np.vstack([self._rawTail, rawENC])
+        
+        self.align()
+        if self.Kinematics is not None:
+            self.reckon()
+        self.publish()
+        return True
+    
+    def align(self):
+        """t_align every pending camera sample already bracketed by encoder samples"""
+        raw, pending = self._rawTail, self._GFCTail
+        if len(raw) == 0:
+            return
+        
+        # Camera samples before encoder timeline can't be interpolated
+        pending = pending[pending[:,0] >= raw[0,0]]
+        ready = pending[:,0] <= raw[-1,0]
+        GFC = pending[ready]
+        self._GFCTail = pending[~ready]
+        
+        if len(GFC) > 0:
+            aligned_rawENC = np.empty_like(GFC)
+            aligned_rawENC[:,0] = GFC[:,0]
+            aligned_rawENC[:,1:4] = TimeIndex(raw).interp(GFC[:,0])
+            self._GFC.append(GFC)
+            self._rawENC.append(aligned_rawENC)
+            self._tAligned = GFC[-1,0]
+        
+        # Keep only encoder samples still needed to bracket later camera samples
+        # (from the first row of a repeated timestamp, which is the one TimeIndex keeps)
+        last = max(np.searchsorted(raw[:,0], self._tAligned, side='right') - 1, 0)
+        start = np.searchsorted(raw[:,0], raw[last,0], side='left')
+        self._rawTail = raw[start:]
+    
+    def reckon(self):
+        """dead-reckon aligned encoder samples not integrated yet"""
+        GFC = self._GFC.data
+        rawENC = self._rawENC.data[self._nReckoned:]
+        if len(rawENC) == 0:
+            return
+        self._nReckoned = self._rawENC.n
+        
+        # Start Integrating From Camera Start Pose (same world frame as GFC)
+        if self._state is None:
+            self._RawtoENC.append(GFC[0])
+            self._state = np.array([rawENC[0,0], GFC[0,1], GFC[0,2], 0.0])
+            rawENC = rawENC[1:]
+        output, self._state = parse.dead_reckon(self.Kinematics, rawENC, GFC[0,3], self._state, self.method)
+        self._RawtoENC.append(output)
+    
+    def publish(self):
+        """expose buffers under the parse attribute names"""
+        self.GFC = self._GFC.data
+        self.ENC = self._ENC.data
+        self.rawENC = self._rawENC.data
+        self.RawtoENC = self._RawtoENC.data
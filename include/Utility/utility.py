@@ -1,11 +1,95 @@
+import os
 import numpy as np
+from functools import lru_cache
+from types import MappingProxyType
+
+# Repository Root (relative config paths resolve against it)
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Binary Cache Class
+class Cache:
+    """
+    Cache of arrays parsed from a source file, stored as memory-mappable .npy files
+    in <source>.cache/ and keyed by path, size, mtime and parser version.
+    """
+    @staticmethod
+    def key(filename: str, version) -> str:
+        stat = os.stat(filename)
+        return f"{os.path.abspath(filename)}|{stat.st_size}|{stat.st_mtime_ns}|{version}"
+
+    @staticmethod
+    def load(filename: str, version, names):
+        """return dict of memory-mapped arrays, or None if the cache is missing or stale"""
+        cache_dir = filename + ".cache"
+        try:
+            with open(os.path.join(cache_dir, "key")) as infile:
+                if infile.read() != Cache.key(filename, version):
+                    return None
+            return {name: np.load(os.path.join(cache_dir, name + ".npy"), mmap_mode='r') for name in names}
+        except OSError:
+            return None
+
+    @staticmethod
+    def save(filename: str, version, arrays: dict):
+        cache_dir = filename + ".cache"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(os.path.join(cache_dir, name + ".npy"), np.ascontiguousarray(array))
+            # Key written last so a partial cache is never valid
+            with open(os.path.join(cache_dir, "key"), "w") as outfile:
+                outfile.write(Cache.key(filename, version))
+        except OSError as e:
+            print(e)
+
+# Config Class
+class Config:
+    """
+    Process-wide cache of YAML configs. Each file is parsed once per modification
+    time into an immutable tree (mappings are read-only views, lists become tuples).
+    """
+    @staticmethod
+    def resolve(path: str) -> str:
+        """absolute path of a config path relative to the repository root"""
+        return os.path.abspath(os.path.join(ROOT, path))
+
+    @staticmethod
+    def freeze(value):
+        if isinstance(value, dict):
+            return MappingProxyType({key: Config.freeze(item) for key, item in value.items()})
+        if isinstance(value, list):
+            return tuple(Config.freeze(item) for item in value)
+        return value
+
+    @staticmethod
+    def load(path: str):
+        """immutable contents of a YAML config (parsed once until the file changes)"""
+        file_path = Config.resolve(path)
+        return Config.parse(file_path, os.path.getmtime(file_path))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def parse(file_path: str, mtime):
+        # YAML Only Imported When A Config Is First Read
+        import yaml
+        with open(file_path, 'r') as file:
+            return Config.freeze(yaml.safe_load(file))
 
 # Utility Class
 class Utility:
+    # Bump when parse_csv output changes to invalidate cached missions
+    PARSER_VERSION = 1
+
     @staticmethod
-    def parse_csv(filename: str, delim = ","):
+    def parse_csv(filename: str, delim = ",", cache = True):
+        """load a mission CSV file and return (bodyPose, bodyVel) arrays"""
+        # Load parsed mission from binary cache
+        if cache:
+            arrays = Cache.load(filename, Utility.PARSER_VERSION, ("bodyPose", "bodyVel"))
+            if arrays is not None:
+                return arrays["bodyPose"], arrays["bodyVel"]
+        
         # Load data from CSV
-        """load a CSV file and return it as a list of dict items"""
         result = []
         with open(filename) as infile:
                 try:
@@ -17,7 +101,10 @@ class Utility:
         bodyPose = list([np.float64(result[k,0]), np.float64(result[k,1]), np.radians(np.float64(result[k,4]))] for k in range(1,len(result)))
         bodyVel = list([np.float64(result[k,2]), np.float64(result[k,3]), np.radians(np.float64(result[k,5]))] for k in range(1,len(result)))
         
-        return np.array(bodyPose), np.array(bodyVel)
+        bodyPose, bodyVel = np.array(bodyPose), np.array(bodyVel)
+        if cache:
+            Cache.save(filename, Utility.PARSER_VERSION, {"bodyPose": bodyPose, "bodyVel": bodyVel})
+        return bodyPose, bodyVel
     
     @staticmethod
     def Rt_2D(th):
@@ -26,8 +113,35 @@ class Utility:
     @staticmethod
     def Rt_2DCenterRef(reference, pose):
         # Transform Body -> Back to Origin (0,0) -> Rotate -> Translate Back to World Frame
-        _rotated = np.zeros_like(reference)
-        _rotated = reference - np.array([pose[0], pose[1]])
-        for n in range(len(reference)): _rotated[n] = (Utility.Rt_2D(pose[2]) @ _rotated[n].reshape(-1,1)).reshape(1,-1)
-        _rotated += np.array([pose[0], pose[1]])
-        return _rotated
\ No newline at end of file
+        center = np.array([pose[0], pose[1]])
+        return Utility.transform_2D(reference - center, pose)
+    
+    @staticmethod
+    def transform_2D(points, pose):
+        """transform (N,2) robot frame points to world frame at pose [x, y, theta] in one matmul"""
+        return points @ Utility.Rt_2D(pose[2]).T + np.array([pose[0], pose[1]])
+    
+    @staticmethod
+    def transform_2D_batch(points, poses):
+        """transform (P,2) robot frame points to world frame at (R,3) poses, returns (R,P,2)"""
+        c = np.cos(poses[:,2])[:,None]
+        s = np.sin(poses[:,2])[:,None]
+        x = points[:,0] * c - points[:,1] * s + poses[:,0:1]
+        y = points[:,0] * s + points[:,1] * c + poses[:,1:2]
+        return np.stack([x, y], axis=-1)
+    
+    @staticmethod
+    def omni_footprint(width, length, dn, bn, yn, radiusWheel, widthWheel):
+        """return robot frame body (4,2) and wheel (N,4,2) polygons of an omni drive"""
+        # Robot Body Point Reference
+        body = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]]) * np.array([width, length])
+        
+        # Wheel Contact Line (screen y axis points down)
+        center = np.column_stack([dn * np.cos(bn), dn * -np.sin(bn)])
+        axis = radiusWheel * np.column_stack([np.sin(yn + bn), np.cos(yn + bn)])
+        a0, a1 = center - axis, center + axis
+        
+        # Wheel Width Offset (normal of contact line)
+        normal = widthWheel * 0.5 * np.column_stack([-(a1[:,1]-a0[:,1]), a1[:,0]-a0[:,0]]) / (2*radiusWheel)
+        wheels = np.stack([a0 + normal, a0 - normal, a1 - normal, a1 + normal], axis=1)
+        return body, wheels
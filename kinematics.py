@@ -4,78 +4,151 @@
 #       trajectory testing purposes        #
 ############################################
 
-import yaml
+import math
 import numpy as np
-from os.path import dirname, join
+from functools import lru_cache
+from os.path import getmtime
+from include.Utility.utility import Config
+
+def indexed(section):
+    """values of a {name0: v0, name1: v1, ...} YAML map ordered by trailing index"""
+    return np.array([float(section[key]) for key in sorted(section, key=lambda key: int("".join(filter(str.isdigit, key))))])
+
+def diff_jacobian(config):
+    """(2,3) wheel rows [left, right] of a differential drive (d: wheel distance from center, mm)"""
+    d = float(config["kinematics"]["d"])
+    return np.array([[1.0, 0.0, -d],
+                     [1.0, 0.0,  d]])
+
+def omni_jacobian(config):
+    """(N,3) wheel rows of an N-wheel omni drive from axle_length / axle_angle / wheel_angle maps"""
+    d = indexed(config["axle_length"])
+    b = np.radians(indexed(config["axle_angle"]))
+    y = np.radians(indexed(config["wheel_angle"]))
+    return np.column_stack([-np.sin(b+y), np.cos(b+y), d*np.cos(y)])
+
+def mecanum_jacobian(config):
+    """(4,3) wheel rows [front left, front right, rear left, rear right] of a 45 degree roller mecanum drive (lx, ly: half wheelbase / track, mm)"""
+    l = float(config["kinematics"]["lx"]) + float(config["kinematics"]["ly"])
+    return np.array([[1.0, -1.0, -l],
+                     [1.0,  1.0,  l],
+                     [1.0,  1.0, -l],
+                     [1.0, -1.0,  l]])
+
+# Drive Model Name -> Wheel Jacobian Builder
+MODELS = {"diff": diff_jacobian, "omni": omni_jacobian, "mecanum": mecanum_jacobian}
 
 class kinematics:
     """
     Class to do kinematics calculation on mobile robot.
+    The drive config is compiled once into an (N,3) wheel Jacobian IKV and its
+    pseudo-inverse KV, so every model shares the same forward / inverse code.
     """
     def __init__(self, path):
-        # Open YAML Config File
-        current_dir = dirname(__file__)
-        file_path = join(current_dir, path)
-        with open(file_path, 'r') as file:
-            self.config = yaml.safe_load(file)
-
-        if self.config['kinematics'] == "diff":
-            self.d = float(self.config["d"]) #(mm) unit
-            self.r = float(self.config['wr']) #(mm) unit
-
-        elif self.config['kinematics'] == "omni":
-            # Wheel Parameter
-            self.d0 = float(self.config['kinematics']["d0"]) #(mm) unit
-            self.d1 = float(self.config['kinematics']["d1"]) #(mm) unit
-            self.d2 = float(self.config['kinematics']["d2"]) #(mm) unit
-            
-            self.b0 = np.radians(float(self.config["b0"]))
-            self.b1 = np.radians(float(self.config["b1"]))
-            self.b2 = np.radians(float(self.config["b2"]))
-            
-            self.y0 = np.radians(float(self.config["y0"]))
-            self.y1 = np.radians(float(self.config["y1"]))
-            self.y2 = np.radians(float(self.config["y2"]))
-            
-            self.r = float(self.config["wr"]) #(mm) unit
-            
-            # Inverse Kinematics Matrix
-            self.IKV = np.array([[-np.sin(self.b0+self.y0), np.cos(self.b0+self.y0), self.d0*np.cos(self.y0)],
-                                 [-np.sin(self.b1+self.y1), np.cos(self.b1+self.y1), self.d1*np.cos(self.y1)],
-                                 [-np.sin(self.b2+self.y2), np.cos(self.b2+self.y2), self.d2*np.cos(self.y2)]])
-
-            # Forward Kinematics Matrix
-            self.KV = np.linalg.inv(self.IKV)
+        # Shared YAML Config (compiled matrices are shared per file version)
+        file_path = Config.resolve(path)
+        self.path = file_path
+        self.config, self.IKV, self.KV, self.pulse_per_mm = kinematics.compile(file_path, getmtime(file_path))
+        self.model = self.config["model"]
+        self.wheels = len(self.IKV)
+
+        # Matmul Operands With Pulse Scaling Folded In
+        self._forward = self.KV / self.pulse_per_mm
+        self._inverse = self.IKV * self.pulse_per_mm
+
+    def __reduce__(self):
+        # Frozen Config Does Not Pickle, Rebuild From The Path (process pool workers)
+        return (kinematics, (self.path,))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def compile(file_path, mtime=None):
+        """
+        Load a drive config and build its read-only wheel Jacobian IKV (N,3),
+        pseudo-inverse KV (3,N) and pulses per mm of wheel travel (wheel.pulse_per_mm,
+        or wheel.ppr per revolution of a wheel of radius wheel.rw, 1 when absent).
+        """
+        config = Config.parse(file_path, mtime)
+        model = config.get("model")
+        if model not in MODELS:
+            raise ValueError(f"unknown drive model: {model}")
+
+        # Inverse Kinematics Matrix
+        IKV = MODELS[model](config)
+
+        # Forward Kinematics Matrix
+        KV = np.linalg.pinv(IKV)
+
+        # Encoder Pulses Per mm Of Wheel Travel
+        wheel = config.get("wheel", {})
+        if "pulse_per_mm" in wheel:
+            pulse_per_mm = float(wheel["pulse_per_mm"])
+        elif "ppr" in wheel:
+            rw = wheel["rw"] if "rw" in wheel else config["kinematics"]["wr"]
+            pulse_per_mm = float(wheel["ppr"]) / (2*np.pi*float(rw))
+        else:
+            pulse_per_mm = 1.0
+
+        IKV.flags.writeable = False
+        KV.flags.writeable = False
+        return config, IKV, KV, pulse_per_mm
 
     def forward(self, actual_motor):
-        """Method for compute (V1,V2,V3) to (Vx, Vy, VTheta) using forward kinematics"""
+        """Method for compute (V1..VN) to (Vx, Vy, VTheta) using forward kinematics"""
         # Calculate Vx, Vy, VTheta
         wheel = actual_motor
-        body = self.KV @ wheel*(1/self.pulse_per_mm)
-        # body = self.KV @ wheel
+        body = self._forward @ wheel
         return body
 
     def inverse(self, cmd_rover):
-        """Method for compute (Vx, Vy, VTheta) to (V1,V2,V3) using inverse kinematics"""
-        # Calculate V1, V2, V3
+        """Method for compute (Vx, Vy, VTheta) to (V1..VN) using inverse kinematics"""
+        # Calculate V1..VN
         body = cmd_rover
-        wheel = self.IKV @ body * self.pulse_per_mm
-        # wheel = self.IKV @ body 
+        wheel = self._inverse @ body
         return wheel
     
-    def rotation(self, dir, input, pose_theta):
-        # Local to Global Transformation Matrix
-        self.T = np.array([[np.cos(pose_theta), -np.sin(pose_theta), 0],
-                           [np.sin(pose_theta), np.cos(pose_theta), 0],
-                           [0, 0, 1]])
+    def forward_batch(self, actual_motor, pose_theta=None):
+        """Vectorized forward kinematics of (N,wheels) wheel speeds, rotated to global frame by (N,) heading if given"""
+        body = actual_motor @ self._forward.T
+        if pose_theta is not None:
+            body = self.rotation_batch("global", body, pose_theta)
+        return body
 
-        # Global to Local Transformation Matrix
-        self.Tt = np.transpose(self.T)
+    def inverse_batch(self, cmd_rover, pose_theta=None):
+        """Vectorized inverse kinematics of (N,3) body twists to (N,wheels), rotated to local frame by (N,) heading if given"""
+        if pose_theta is not None:
+            cmd_rover = self.rotation_batch("local", cmd_rover, pose_theta)
+        return cmd_rover @ self._inverse.T
 
+    def rotation_batch(self, dir, input, pose_theta, out=None):
+        """Rotate (N,3) rows by (N,) headings (z row/column is identity, so only x/y are rotated)"""
+        c = np.cos(pose_theta)
+        s = np.sin(pose_theta)
         if (dir == "local"):
-            output = self.Tt @ input
-        elif (dir == "global"):
-            output = self.T @ input
+            s = -s
         
-        return output
-    
\ No newline at end of file
+        if out is None:
+            out = np.empty_like(input, dtype=np.float64)
+        x = input[:,0] * c - input[:,1] * s
+        out[:,1] = input[:,0] * s + input[:,1] * c
+        out[:,0] = x
+        out[:,2] = input[:,2]
+        return out
+
+    def rotation(self, dir, input, pose_theta, out=None):
+        """Rotate (3,1) or (3,) input by heading, writing into out if given (z is passed through)"""
+        # Local to Global Rotation (scalar trig, headings rarely repeat so nothing is cached)
+        c = math.cos(pose_theta)
+        s = math.sin(pose_theta)
+
+        # Global to Local Rotation
+        if (dir == "local"):
+            s = -s
+
+        if out is None:
+            out = np.empty_like(input, dtype=np.float64)
+        x, y = input.flat[0], input.flat[1]
+        out[0] = x * c - y * s
+        out[1] = x * s + y * c
+        out[2:] = input[2:]
+        return out
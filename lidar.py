@@ -0,0 +1,157 @@
+import threading
+import numpy as np
+import registry
+from include.Utility.utility import Utility
+from occupancy import OccupancyGrid
+from collision import distance_transform
+
+# Largest grid (cells) given a distance field (float32 4 B/cell kept, ~5 s to build at the limit)
+DISTANCE_MAX_CELLS = 1 << 24
+
+class Lidar:
+    """
+    Simulated 2D laser scanner over an OccupancyGrid. All beams of all robots are
+    marched together; each step goes to the next cell boundary (DDA), so hits are
+    exact cell entries. Beams without a return read max_range. With distance=True
+    (grids up to DISTANCE_MAX_CELLS) a distance field is built on a background
+    thread and steps jump the free space to the nearest obstacle; scans use DDA
+    until it is ready. After grid edits the field is rebuilt in the background and
+    meanwhile bounded by the distance to the edited tiles, so scans stay exact.
+    """
+    def __init__(self, grid, mount=(0.0, 0.0, 0.0), fov=2*np.pi, beams=360, max_range=8000.0, noise=0.0,
+                 rate=40.0, occupied_thresh=50, distance=False, seed=None):
+        self.grid = grid
+        self.mount = np.array(mount, dtype=np.float64)
+        self.fov = fov
+        self.beams = beams
+        self.max_range = float(max_range)
+        self.noise = noise
+        self.rate = rate
+        self.rng = np.random.default_rng(seed)
+
+        # Beam Angles In Robot Frame (no duplicate beam on a full circle)
+        self.angles = self.mount[2] + np.linspace(-fov/2, fov/2, beams, endpoint=fov < 2*np.pi)
+
+        # Cell Value -> Reflects (unknown space does not)
+        self.blocked = np.zeros(256, dtype=bool)
+        self.blocked[occupied_thresh:OccupancyGrid.UNKNOWN] = True
+
+        # Distance Field (grid version it was built from, field), built off the scan path
+        self.useDistance = distance and grid.cells.size <= DISTANCE_MAX_CELLS
+        self._field = (None, None)
+        self._builder = None
+        if self.useDistance:
+            self.rebuild()
+
+    @staticmethod
+    def from_config(grid, robot_config, **kwargs):
+        """scanner from the lidar section of a drive config (mm, degrees), or None if there is none"""
+        lidar = registry.robot(robot_config).lidar
+        if lidar is None:
+            return None
+        return Lidar(grid, **Lidar.parameters(lidar), **kwargs)
+
+    @staticmethod
+    def parameters(lidar):
+        """Lidar keyword arguments from a drive config lidar section"""
+        return dict(mount=(lidar.get("x", 0.0), lidar.get("y", 0.0), np.radians(lidar.get("th", 0.0))),
+                    fov=np.radians(lidar.get("fov", 360.0)), beams=int(lidar.get("beams", 360)),
+                    max_range=float(lidar.get("range", 8000.0)), noise=float(lidar.get("noise", 0.0)),
+                    rate=float(lidar.get("rate", 40.0)))
+
+    def rebuild(self):
+        """start building the distance field of the current grid on a background thread (unless one runs)"""
+        if self._builder is None or not self._builder.is_alive():
+            self._builder = threading.Thread(target=self._build, daemon=True)
+            self._builder.start()
+        return self._builder
+
+    def _build(self):
+        # Version Read Before The Cells, Later Edits Stay Marked On Their Tiles
+        version = self.grid.version
+        self._field = (version, distance_transform(self.blocked[self.grid.cells]))
+
+    def distance(self):
+        """distance field (cells) to the nearest reflecting cell of the current grid, waiting for its build (None above DISTANCE_MAX_CELLS)"""
+        if self.grid.cells.size > DISTANCE_MAX_CELLS:
+            return None
+        while self._field[0] != self.grid.version:
+            self.rebuild().join()
+        return self._field[1]
+
+    def origins(self, poses):
+        """(R,3) world sensor poses of robots at (R,3) poses"""
+        poses = np.atleast_2d(poses)
+        xy = Utility.transform_2D_batch(self.mount[None, :2], poses)[:, 0]
+        return np.column_stack([xy, poses[:, 2]])
+
+    def _lookup(self, points):
+        """cell row/col of (N,2) points and whether they are inside the grid"""
+        rc = self.grid.world_to_cell(points)
+        inside = (rc[:,0] >= 0) & (rc[:,0] < self.grid.height) & (rc[:,1] >= 0) & (rc[:,1] < self.grid.width)
+        return rc, inside
+
+    def scan(self, poses):
+        """(R, beams) ranges seen by robots at (R,3) (or (3,)) poses"""
+        single = np.ndim(poses) == 1
+        sensor = self.origins(poses)
+        angle = (sensor[:, 2:3] + self.angles).ravel()
+        origin = np.repeat(sensor[:, :2], self.beams, axis=0)
+        direction = np.column_stack([np.cos(angle), np.sin(angle)])
+
+        ranges = np.full(len(angle), self.max_range)
+        hit = np.zeros(len(angle), dtype=bool)
+        # Latest Distance Field, Rebuilt In The Background Once The Grid Was Edited
+        version, distance = self._field
+        edited = None
+        if distance is not None and version != self.grid.version:
+            self.rebuild()
+            edited = self.grid.edit_distance(version)
+        resolution = self.grid.resolution
+
+        # March Active Rays Until They Hit, Leave The Grid Or Run Out Of Range
+        cells, height, width = self.grid.cells, self.grid.height, self.grid.width
+        index = np.arange(len(angle))
+        x, y = (origin - self.grid.origin).T / resolution
+        # Near-Axis Components Too Small For The Step Nudge To Move The Ray Count As Zero
+        dx, dy = np.where(np.abs(direction) < 1e-6, 0.0, direction).T
+        t = np.zeros(len(angle))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            while len(index):
+                # Current Cell (grid units)
+                cx, cy = x + t * dx, y + t * dy
+                col, row = np.floor(cx).astype(np.int64), np.floor(cy).astype(np.int64)
+                inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+                reflect = np.zeros(len(index), dtype=bool)
+                reflect[inside] = self.blocked[cells[row[inside], col[inside]]]
+                ranges[index[reflect]] = t[reflect] * resolution
+                hit[index[reflect]] = True
+                keep = inside & ~reflect
+                index, x, y, dx, dy, t, cx, cy, col, row = (a[keep] for a in (index, x, y, dx, dy, t, cx, cy, col, row))
+
+                # Step To The Next Cell Boundary Along The Beam
+                step = np.minimum(np.where(dx > 0, (col + 1 - cx) / dx, np.where(dx < 0, (col - cx) / dx, np.inf)),
+                                  np.where(dy > 0, (row + 1 - cy) / dy, np.where(dy < 0, (row - cy) / dy, np.inf))) + 1e-6
+
+                # Or Jump Free Space Up To The Nearest Obstacle (minus cell quantization)
+                if distance is not None:
+                    free = distance[row, col]
+                    # Edited Tiles May Hold New Obstacles, Jump No Further Than Them
+                    if edited is not None:
+                        free = np.minimum(free, edited[row // self.grid.TILE, col // self.grid.TILE])
+                    step = np.maximum(step, free - np.sqrt(2))
+                t = t + step
+                keep = t * resolution <= self.max_range
+                index, x, y, dx, dy, t = (a[keep] for a in (index, x, y, dx, dy, t))
+
+        index = np.flatnonzero(hit)
+        if self.noise > 0:
+            ranges[index] += self.rng.normal(0.0, self.noise, len(index))
+        ranges = ranges.reshape(-1, self.beams)
+        return ranges[0] if single else ranges
+
+    def points(self, poses, ranges):
+        """(R, beams, 2) world end points of (R, beams) ranges"""
+        sensor = self.origins(poses)
+        angle = sensor[:, 2:3] + self.angles
+        return sensor[:, None, :2] + ranges.reshape(-1, self.beams)[..., None] * np.stack([np.cos(angle), np.sin(angle)], axis=-1)
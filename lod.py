@@ -0,0 +1,39 @@
+import numpy as np
+
+class TrajectoryLOD:
+    """
+    Multi-resolution pyramid of a (N,2) trajectory by per-pixel decimation. Level L
+    keeps the first point of every run of samples falling in the same cell of size
+    base_cell * 2**L, so the points kept for a zoom level are bounded by the cells
+    (pixels) the path crosses rather than by the number of samples.
+    """
+    def __init__(self, points, base_cell=None):
+        self.points = points
+        extent = max(np.ptp(points, axis=0).max() if len(points) > 0 else 1.0, 1e-9)
+        self.base_cell = extent / 2**20 if base_cell is None else base_cell
+
+        # Each level decimates the previous one, up to cells larger than the whole path
+        self.levels = [np.arange(len(points))]
+        while len(self.levels[-1]) > 2 and self.cell(len(self.levels)) <= extent:
+            idx = self.levels[-1]
+            cell = np.floor(points[idx] / self.cell(len(self.levels)))
+            keep = np.ones(len(idx), dtype=bool)
+            keep[1:] = np.any(cell[1:] != cell[:-1], axis=1)
+            keep[-1] = True
+            self.levels.append(idx[keep])
+
+    def cell(self, level):
+        return self.base_cell * 2.0**(level - 1) if level > 0 else 0.0
+
+    def level_for(self, scale):
+        """coarsest level whose cell is at most one pixel at scale (pixels per world unit)"""
+        level = int(np.floor(np.log2(max(1.0 / (scale * self.base_cell), 1e-300)))) + 1
+        return min(max(level, 0), len(self.levels) - 1)
+
+    def indices(self, level, start, end):
+        """sample indices of level in [start, end), always ending on end-1"""
+        idx = self.levels[level]
+        sel = idx[np.searchsorted(idx, start):np.searchsorted(idx, end)]
+        if end > start and (len(sel) == 0 or sel[-1] != end - 1):
+            sel = np.append(sel, end - 1)
+        return sel
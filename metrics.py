@@ -0,0 +1,118 @@
+############################################
+#        ODOMETRY ACCURACY METRICS         #
+#  ATE / RPE / drift of an estimated track #
+#  against GFC ground truth (whole arrays) #
+############################################
+
+import numpy as np
+
+def wrap(th):
+    """angle(s) wrapped to [-pi, pi)"""
+    return (th + np.pi) % (2*np.pi) - np.pi
+
+def resample(track, t):
+    """[t, x, y, th] track linearly interpolated at (N,) times (heading unwrapped first)"""
+    th = np.unwrap(track[:,3])
+    out = np.column_stack([t, np.interp(t, track[:,0], track[:,1]), np.interp(t, track[:,0], track[:,2]),
+                           wrap(np.interp(t, track[:,0], th))])
+    return out
+
+def align_se2(est, gt):
+    """rigid (rotation th, translation (2,)) least-squares fit mapping est x/y onto gt x/y"""
+    ce, cg = est[:,1:3].mean(axis=0), gt[:,1:3].mean(axis=0)
+    e, g = est[:,1:3] - ce, gt[:,1:3] - cg
+    th = np.arctan2(np.sum(e[:,0]*g[:,1] - e[:,1]*g[:,0]), np.sum(e[:,0]*g[:,0] + e[:,1]*g[:,1]))
+    c, s = np.cos(th), np.sin(th)
+    return th, cg - np.array([c*ce[0] - s*ce[1], s*ce[0] + c*ce[1]])
+
+def apply_se2(track, th, translation):
+    """[t, x, y, th] track moved by a rigid transform"""
+    c, s = np.cos(th), np.sin(th)
+    out = np.array(track, dtype=np.float64)
+    out[:,1] = c*track[:,1] - s*track[:,2] + translation[0]
+    out[:,2] = s*track[:,1] + c*track[:,2] + translation[1]
+    out[:,3] = wrap(track[:,3] + th)
+    return out
+
+def stats(errors):
+    """rmse / mean / median / max of an error array"""
+    if len(errors) == 0:
+        return {"rmse": np.nan, "mean": np.nan, "median": np.nan, "max": np.nan}
+    return {"rmse": np.sqrt(np.mean(errors**2)), "mean": np.mean(errors), "median": np.median(errors), "max": np.max(errors)}
+
+def ate(est, gt, align=False):
+    """absolute trajectory error: per-sample position error (N,) and its stats, optionally after SE(2) alignment"""
+    if align:
+        est = apply_se2(est, *align_se2(est, gt))
+    errors = np.hypot(est[:,1] - gt[:,1], est[:,2] - gt[:,2])
+    return errors, stats(errors)
+
+def distance(track):
+    """(N,) cumulative path length of a track"""
+    return np.concatenate([[0.0], np.cumsum(np.hypot(np.diff(track[:,1]), np.diff(track[:,2])))])
+
+def pairs(gt, window, by="samples", travelled=None):
+    """(i, j) index pairs (slices for samples) separated by window samples, ms of time or mm of ground-truth distance"""
+    n = len(gt)
+    if by == "samples":
+        m = max(n - int(window), 0)
+        return slice(0, m), slice(n - m, n)
+    if by == "time":
+        axis = gt[:,0]
+    elif by == "distance":
+        axis = distance(gt) if travelled is None else travelled
+    else:
+        raise ValueError(f"unknown window unit: {by}")
+    j = np.searchsorted(axis, axis + window, side='left')
+    i = np.flatnonzero(j < n)
+    return i, j[i]
+
+def columns(track):
+    """contiguous x, y, th, cos(th), sin(th) of a track (shared by RPE windows)"""
+    th = np.ascontiguousarray(track[:,3])
+    return np.ascontiguousarray(track[:,1]), np.ascontiguousarray(track[:,2]), th, np.cos(th), np.sin(th)
+
+def relative(cols, i, j):
+    """motion from pose i to pose j in the frame of pose i: R(-th_i) (p_j - p_i), th_j - th_i"""
+    x, y, th, c, s = cols
+    dx, dy, ci, si = x[j] - x[i], y[j] - y[i], c[i], s[i]
+    return ci*dx + si*dy, ci*dy - si*dx, th[j] - th[i]
+
+def rpe(est, gt, window, by="samples", travelled=None, cols=None):
+    """
+    Relative pose error over window: motion between poses i and j of est vs gt,
+    both expressed in the frame of pose i. Return per-pair translation (N,) and
+    rotation (N,) errors with their stats.
+    """
+    i, j = pairs(gt, window, by, travelled)
+    cols_est, cols_gt = (columns(est), columns(gt)) if cols is None else cols
+    ex, ey, eth = relative(cols_est, i, j)
+    gx, gy, gth = relative(cols_gt, i, j)
+    translation = np.hypot(ex - gx, ey - gy)
+    rotation = np.abs(wrap(eth - gth))
+    return translation, rotation, {"translation": stats(translation), "rotation": stats(rotation)}
+
+def drift(est, gt, travelled=None):
+    """heading drift (N,) unwrapped over time, and final position / heading drift per travelled distance"""
+    heading = np.unwrap(wrap(est[:,3] - gt[:,3]))
+    travelled = (distance(gt) if travelled is None else travelled)[-1]
+    final = np.linalg.norm(est[-1,1:3] - gt[-1,1:3])
+    return heading, {"distance": travelled,
+                     "final_error": final,
+                     "drift_pct": 100 * final / travelled if travelled > 0 else np.nan,
+                     "heading_drift_deg": np.degrees(heading[-1]),
+                     "heading_deg_per_m": np.degrees(heading[-1]) / (travelled * 1e-3) if travelled > 0 else np.nan}
+
+def evaluate(est, gt, windows=(1000.0,), by="distance", align=False):
+    """flat dict of ATE, RPE per window and drift metrics of est vs gt on the same timeline"""
+    travelled = distance(gt)
+    _, ate_stats = ate(est, gt, align)
+    _, drift_stats = drift(est, gt, travelled)
+    result = {f"ate_{key}": value for key, value in ate_stats.items()}
+    cols = columns(est), columns(gt)
+    for window in windows:
+        _, _, rpe_stats = rpe(est, gt, window, by, travelled, cols)
+        result[f"rpe_{window:g}_translation_rmse"] = rpe_stats["translation"]["rmse"]
+        result[f"rpe_{window:g}_rotation_rmse_deg"] = np.degrees(rpe_stats["rotation"]["rmse"])
+    result.update(drift_stats)
+    return result
@@ -0,0 +1,162 @@
+import os
+import numpy as np
+from include.Utility.utility import Cache
+
+class OccupancyGrid:
+    """
+    Occupancy-grid map stored as a compact (H,W) uint8 array: FREE, OCCUPIED or
+    UNKNOWN per cell. Cell (row, col) covers world x in origin_x + col*resolution
+    and world y in origin_y + row*resolution (y grows with rows, like the screen).
+    Large maps stay memory-mapped until edited. Images of a ROS map .yaml are
+    stored bottom row first, since its origin is the pose of the lower-left pixel.
+    """
+    FREE, OCCUPIED, UNKNOWN = 0, 100, 255
+    # Cells per side of a render tile
+    TILE = 256
+    # Bump when image conversion changes to invalidate cached grids
+    VERSION = 1
+
+    def __init__(self, cells, resolution=1.0, origin=(0.0, 0.0)):
+        self.cells = cells
+        self.resolution = float(resolution)
+        self.origin = np.array(origin[:2], dtype=np.float64)
+        self.height, self.width = cells.shape
+
+        # Edit Counter, Stamped On Every Tile An Edit Touches
+        self.version = 0
+        self._tileVersion = np.zeros((-(-self.height // self.TILE), -(-self.width // self.TILE)), dtype=np.int64)
+
+    @staticmethod
+    def load(path, resolution=1.0, origin=(0.0, 0.0), cache=True):
+        """
+        load a .npy grid, a PGM/PNG image (row 0 at origin) or a ROS map .yaml (image, resolution,
+        origin of the lower-left pixel with zero yaw, thresholds)
+        """
+        occupied_thresh, free_thresh, negate = 0.65, 0.196, False
+        bottom_up = False
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            with open(path) as infile:
+                meta = yaml.safe_load(infile)
+            resolution = meta.get("resolution", resolution)
+            origin = meta.get("origin", origin)
+            if len(origin) > 2 and origin[2] != 0:
+                raise ValueError(f"{path}: rotated map origin (yaw {origin[2]}) is not supported")
+            bottom_up = True
+            occupied_thresh = meta.get("occupied_thresh", occupied_thresh)
+            free_thresh = meta.get("free_thresh", free_thresh)
+            negate = bool(meta.get("negate", False))
+            path = os.path.join(os.path.dirname(path), meta["image"])
+
+        # Grid Already In Cell Values
+        if path.endswith(".npy"):
+            return OccupancyGrid(np.load(path, mmap_mode='r'), resolution, origin)
+
+        # Image Converted Once, Then Memory-Mapped From Cache
+        arrays = Cache.load(path, (OccupancyGrid.VERSION, occupied_thresh, free_thresh, negate), ("GRID",)) if cache else None
+        if arrays is not None:
+            cells = arrays["GRID"]
+        else:
+            pixels = OccupancyGrid.read_pgm(path) if path.endswith(".pgm") else OccupancyGrid.read_image(path)
+            cells = OccupancyGrid.from_pixels(pixels, occupied_thresh, free_thresh, negate)
+            if cache:
+                Cache.save(path, (OccupancyGrid.VERSION, occupied_thresh, free_thresh, negate), {"GRID": cells})
+
+        # ROS Images Start With The Top Row, Grid Rows Start At The Origin (view, stays mapped)
+        if bottom_up:
+            cells = cells[::-1]
+        return OccupancyGrid(cells, resolution, origin)
+
+    @staticmethod
+    def read_pgm(path):
+        """memory-map the pixels of a binary (P5) 8-bit PGM"""
+        with open(path, "rb") as infile:
+            fields = []
+            while len(fields) < 4:
+                line = infile.readline()
+                if not line:
+                    raise ValueError(f"{path}: truncated PGM header")
+                fields += line.split(b"#")[0].split()
+            offset = infile.tell()
+        if fields[0] != b"P5" or int(fields[3]) > 255:
+            raise ValueError(f"{path}: only binary 8-bit PGM (P5) is supported")
+        width, height = int(fields[1]), int(fields[2])
+        return np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(height, width))
+
+    @staticmethod
+    def read_image(path):
+        """(H,W) uint8 gray pixels of any image pygame can load"""
+        import pygame
+        rgb = pygame.surfarray.array3d(pygame.image.load(path))
+        return rgb.mean(axis=2).astype(np.uint8).T
+
+    @staticmethod
+    def from_pixels(pixels, occupied_thresh=0.65, free_thresh=0.196, negate=False, chunk_rows=1024):
+        """threshold gray pixels (dark = occupied) into cell values, a band of rows at a time"""
+        lut = np.full(256, OccupancyGrid.UNKNOWN, dtype=np.uint8)
+        p = np.arange(256) / 255.0 if negate else (255 - np.arange(256)) / 255.0
+        lut[p > occupied_thresh] = OccupancyGrid.OCCUPIED
+        lut[p < free_thresh] = OccupancyGrid.FREE
+
+        cells = np.empty(pixels.shape, dtype=np.uint8)
+        for r in range(0, pixels.shape[0], chunk_rows):
+            cells[r:r+chunk_rows] = lut[pixels[r:r+chunk_rows]]
+        return cells
+
+    def save(self, path):
+        np.save(path, np.ascontiguousarray(self.cells))
+
+    def extent(self):
+        """world box (xmin, ymin, xmax, ymax) covered by the grid"""
+        return (*self.origin, *(self.origin + self.resolution * np.array([self.width, self.height])))
+
+    def world_to_cell(self, points):
+        """(..., 2) world points -> (..., 2) integer (row, col), possibly outside the grid"""
+        return np.floor((np.asarray(points)[..., ::-1] - self.origin[::-1]) / self.resolution).astype(np.int64)
+
+    def cell_to_world(self, cells):
+        """(..., 2) (row, col) -> (..., 2) world centers of the cells"""
+        return (np.asarray(cells)[..., ::-1] + 0.5) * self.resolution + self.origin
+
+    def value(self, points):
+        """cell values under (..., 2) world points, UNKNOWN outside the grid"""
+        rc = self.world_to_cell(points)
+        inside = (rc[..., 0] >= 0) & (rc[..., 0] < self.height) & (rc[..., 1] >= 0) & (rc[..., 1] < self.width)
+        out = np.full(rc.shape[:-1], self.UNKNOWN, dtype=np.uint8)
+        out[inside] = self.cells[rc[inside][:,0], rc[inside][:,1]]
+        return out
+
+    def set(self, points, value):
+        """write value into the cells under (N,2) world points and mark their tiles changed"""
+        rc = self.world_to_cell(np.atleast_2d(points))
+        rc = rc[(rc[:,0] >= 0) & (rc[:,0] < self.height) & (rc[:,1] >= 0) & (rc[:,1] < self.width)]
+        if not len(rc):
+            return
+        # Copy Memory-Mapped Grid On First Edit
+        if not self.cells.flags.writeable:
+            self.cells = np.array(self.cells)
+        self.cells[rc[:,0], rc[:,1]] = value
+        self.version += 1
+        self._tileVersion[rc[:,0] // self.TILE, rc[:,1] // self.TILE] = self.version
+
+    def edit_distance(self, version):
+        """(tile rows, tile cols) lower bound (cells) on the distance from each tile to cells edited after version"""
+        ty, tx = np.nonzero(self._tileVersion > version)
+        rows, cols = self._tileVersion.shape
+        gap_row = np.maximum(np.abs(np.arange(rows)[:,None] - ty) - 1, 0) * self.TILE
+        gap_col = np.maximum(np.abs(np.arange(cols)[:,None] - tx) - 1, 0) * self.TILE
+        return np.hypot(gap_row[:,None,:], gap_col[None,:,:]).min(axis=2, initial=np.inf)
+
+    def tiles(self, step=1):
+        """number of (rows, cols) tiles when every tile samples every step-th cell"""
+        size = self.TILE * step
+        return -(-self.height // size), -(-self.width // size)
+
+    def tile(self, ty, tx, step=1):
+        """cells of tile (ty, tx), sampling every step-th cell so a tile spans TILE*step cells"""
+        size = self.TILE * step
+        return self.cells[ty*size:(ty+1)*size:step, tx*size:(tx+1)*size:step]
+
+    def tile_version(self, ty, tx, step=1):
+        """last edit touching tile (ty, tx) at sampling step"""
+        return self._tileVersion[ty*step:(ty+1)*step, tx*step:(tx+1)*step].max()
@@ -1,12 +1,19 @@
 import sys
-import yaml
+import time
 import pygame
 import pygame.gfxdraw
 
 import numpy as np
-from os.path import dirname, join
 
+import registry
 from include.Utility.utility import *
+from player import TrajectoryPlayer
+from lod import TrajectoryLOD
+from camera import Camera
+from occupancy import OccupancyGrid
+from lidar import Lidar
+from kinematics import indexed
+from collections import OrderedDict
 
 # Button Class
 class Button:
@@ -33,9 +40,11 @@ class Slider:
         self.dragging = False
 
     def draw(self, screen):
-        pygame.draw.rect(screen, GRAY, self.rect)
+        """draw bar and handle, return dirty rect (the handle overhangs the bar ends)"""
+        bar = pygame.draw.rect(screen, GRAY, self.rect)
         handle_x = self.rect.x + (self.value / self.max_value) * self.rect.width
-        pygame.draw.circle(screen, BLUE, (int(handle_x), self.rect.centery), self.rect.height // 2)
+        handle = pygame.draw.circle(screen, BLUE, (int(handle_x), self.rect.centery), self.rect.height // 2)
+        return bar.union(handle)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -51,48 +60,221 @@ class Slider:
 # Robot Class
 class RobotOmni:
     def __init__(self, robot_config):
-        # Open YAML Config File
-        current_dir = dirname(__file__)
-        file_path = join(current_dir, robot_config)
+        # Shared Robot Description (YAML parsed once per process)
+        self.description = registry.robot(robot_config)
+        robot = self.description.config
+        
+        self.widthRobot  = robot["body"]["width"]
+        self.heightRobot = robot["body"]["height"]
+        self.lengthRobot = robot["body"]["length"]
+        self.radiusWheel = np.float32(robot["wheel"]["rw"])
+        self.widthWheel = np.float32(robot["wheel"]["width"])
+        
+        # Wheels Ordered By Key Index, Like The Kinematics Rows
+        self.dn = indexed(robot["axle_length"])
+        self.bn = np.radians(indexed(robot["axle_angle"]))
+        self.yn = np.radians(indexed(robot["wheel_angle"]))
+        
+        # Optional Laser Scanner Section
+        self.lidarConfig = self.description.lidar
+        
+        # Robot Frame Footprint (body + wheel polygons stacked for one transform per frame)
+        self.footprint = self.description.footprint
+        self.radius = np.max(np.linalg.norm(self.footprint, axis=1))
 
-        with open(file_path, 'r') as file:
-            robot = yaml.safe_load(file)
-            
-            self.widthRobot  = robot["body"]["width"]
-            self.heightRobot = robot["body"]["height"]
-            self.lengthRobot = robot["body"]["length"]
-            self.radiusWheel = np.float32(robot["wheel"]["rw"])
-            self.widthWheel = np.float32(robot["wheel"]["width"])
-            
-            self.dn = np.array([val for (key,val) in robot["axle_length"].items()], dtype='f8')
-            self.bn = np.array([np.radians(val) for (key,val) in robot["axle_angle"].items()], dtype='f8')
-            self.yn = np.array([np.radians(val) for (key,val) in robot["wheel_angle"].items()], dtype='f8')
-
-    def draw(self, screen, pose):
-        # Robot Body Point Reference
-        _pointRef = np.array([[pose[0]-self.widthRobot*0.5, pose[1]-self.lengthRobot*0.5],
-                              [pose[0]+self.widthRobot*0.5, pose[1]-self.lengthRobot*0.5],
-                              [pose[0]+self.widthRobot*0.5, pose[1]+self.lengthRobot*0.5],
-                              [pose[0]-self.widthRobot*0.5, pose[1]+self.lengthRobot*0.5]])
-
-        for i in range(len(self.dn)):
-            _wheelAngleRef = np.array([[pose[0] + (self.dn[i] * np.cos(self.bn[i]) - self.radiusWheel * np.sin(self.yn[i] + self.bn[i])), pose[1] + (self.dn[i] * -np.sin(self.bn[i]) - self.radiusWheel * np.cos(self.yn[i] + self.bn[i]))],
-                                       [pose[0] + (self.dn[i] * np.cos(self.bn[i]) + self.radiusWheel * np.sin(self.yn[i] + self.bn[i])), pose[1] + (self.dn[i] * -np.sin(self.bn[i]) + self.radiusWheel * np.cos(self.yn[i] + self.bn[i]))]])
-    
-            _wheelRef = np.array([[_wheelAngleRef[0,0] + self.widthWheel * 0.5 * -(_wheelAngleRef[1,1]-_wheelAngleRef[0,1])/(2*self.radiusWheel), _wheelAngleRef[0,1] + self.widthWheel * 0.5 * (_wheelAngleRef[1,0]-_wheelAngleRef[0,0])/(2*self.radiusWheel)],
-                                  [_wheelAngleRef[0,0] + self.widthWheel * 0.5 * (_wheelAngleRef[1,1]-_wheelAngleRef[0,1])/(2*self.radiusWheel), _wheelAngleRef[0,1] + self.widthWheel * 0.5 * -(_wheelAngleRef[1,0]-_wheelAngleRef[0,0])/(2*self.radiusWheel)],
-                                  [_wheelAngleRef[1,0] + self.widthWheel * 0.5 * (_wheelAngleRef[1,1]-_wheelAngleRef[0,1])/(2*self.radiusWheel), _wheelAngleRef[1,1] + self.widthWheel * 0.5 * -(_wheelAngleRef[1,0]-_wheelAngleRef[0,0])/(2*self.radiusWheel)],
-                                  [_wheelAngleRef[1,0] + self.widthWheel * 0.5 * -(_wheelAngleRef[1,1]-_wheelAngleRef[0,1])/(2*self.radiusWheel), _wheelAngleRef[1,1] + self.widthWheel * 0.5 * (_wheelAngleRef[1,0]-_wheelAngleRef[0,0])/(2*self.radiusWheel)]])
-            # Draw Wheel Lines
-            pygame.gfxdraw.filled_polygon(screen, Utility.Rt_2DCenterRef(_wheelRef, pose), RED)
-            pygame.gfxdraw.aapolygon(screen, Utility.Rt_2DCenterRef(_wheelRef, pose), RED)
+    def draw(self, screen, pose, camera=None):
+        """draw robot at pose (through camera if given), return its dirty rect"""
+        # Transform Footprint To World Frame (and Screen)
+        _points = Utility.transform_2D(self.footprint, pose)
+        if camera is not None:
+            _points = camera.apply(_points)
+        
+        # Draw Wheel Lines
+        for _wheelRef in _points[4:].reshape(-1,4,2):
+            pygame.gfxdraw.filled_polygon(screen, _wheelRef, RED)
+            pygame.gfxdraw.aapolygon(screen, _wheelRef, RED)
 
         # Draw Robot Body Lines
-        pygame.draw.aalines(screen, BLACK, True, Utility.Rt_2DCenterRef(_pointRef, pose), 3)
+        pygame.draw.aalines(screen, BLACK, True, _points[:4], 3)
+        return RobotOmni.bounding_rect(_points)
+
+    @staticmethod
+    def bounding_rect(points, margin=2):
+        """pygame.Rect around (N,2) points, padded for antialiasing"""
+        _min = np.floor(points.min(axis=0)) - margin
+        _max = np.ceil(points.max(axis=0)) + margin
+        return pygame.Rect(int(_min[0]), int(_min[1]), int(_max[0] - _min[0]), int(_max[1] - _min[1]))
+
+    def draw_batch(self, screen, poses, camera):
+        """draw a fleet at (R,3) poses through camera, culling robots outside its view, return dirty rects"""
+        # Cull Robots Outside Visible Map (center +- footprint radius)
+        _visible = camera.visible(poses[:,:2], self.radius)
+        
+        # Transform Every Visible Footprint To Screen At Once
+        _rects = []
+        for _points in camera.apply(Utility.transform_2D_batch(self.footprint, poses[_visible])):
+            for _wheelRef in _points[4:].reshape(-1,4,2):
+                pygame.gfxdraw.filled_polygon(screen, _wheelRef, RED)
+                pygame.gfxdraw.aapolygon(screen, _wheelRef, RED)
+            pygame.draw.aalines(screen, BLACK, True, _points[:4], 3)
+            _rects.append(RobotOmni.bounding_rect(_points))
+        return _rects
+
+# Trail Class
+class Trail:
+    """
+    Track history drawn incrementally up to the playback time. Drawn points are
+    kept in a preallocated ring buffer so a full redraw is one aalines call, and
+    each frame only appends and draws the samples that became visible. Samples
+    come from the level of detail matching the camera scale and are stored
+    already transformed to screen.
+    """
+    def __init__(self, t, points, color, camera, capacity=200_000):
+        self.t = t
+        self.points = points
+        self.color = color
+        self.camera = camera
+        self.lod = TrajectoryLOD(points)
+        self.level = self.lod.level_for(camera.scale)
+        self._buffer = np.empty((capacity, 2))
+        self.reset()
+
+    def reset(self):
+        self.cursor = 0
+        self._start = 0
+        self._count = 0
+
+    def set_view(self):
+        """switch level of detail and rebuild the drawn history after a camera change"""
+        self.level = self.lod.level_for(self.camera.scale)
+        self._start = 0
+        self._count = 0
+        self.append(self.camera.apply(self.points[self.lod.indices(self.level, 0, self.cursor)]))
+
+    def rewound(self, time) -> bool:
+        return self.cursor > 0 and time < self.t[self.cursor-1]
+
+    def append(self, points):
+        # Keep only what fits, overwriting the oldest points
+        _capacity = len(self._buffer)
+        points = points[-_capacity:]
+        _end = (self._start + self._count) % _capacity
+        _first = min(len(points), _capacity - _end)
+        self._buffer[_end:_end+_first] = points[:_first]
+        self._buffer[:len(points)-_first] = points[_first:]
+        _overflow = max(self._count + len(points) - _capacity, 0)
+        self._start = (self._start + _overflow) % _capacity
+        self._count = min(self._count + len(points), _capacity)
+
+    def history(self):
+        """drawn points in chronological order"""
+        _end = self._start + self._count
+        if _end <= len(self._buffer):
+            return self._buffer[self._start:_end]
+        return np.vstack([self._buffer[self._start:], self._buffer[:_end - len(self._buffer)]])
+
+    def last(self):
+        """(1,2) most recently drawn point (empty before the first)"""
+        if self._count == 0:
+            return self._buffer[:0]
+        _k = (self._start + self._count - 1) % len(self._buffer)
+        return self._buffer[_k:_k+1]
+
+    def update(self, surface, time):
+        """append samples up to time and draw only the new segments, return dirty rect"""
+        _end = int(np.searchsorted(self.t, time, side='right'))
+        if _end <= self.cursor:
+            return None
+        _new = self.camera.apply(self.points[self.lod.indices(self.level, self.cursor, _end)])
+        
+        # Connect To Last Drawn Point
+        _segment = np.vstack([self.last(), _new])
+        self.append(_new)
+        self.cursor = _end
+        if len(_segment) < 2:
+            return None
+        return pygame.draw.aalines(surface, self.color, False, _segment)
+
+    def redraw(self, surface):
+        if self._count >= 2:
+            pygame.draw.aalines(surface, self.color, False, self.history())
+
+# Occupancy Grid View Class
+class GridView:
+    """
+    Tiled renderer of an OccupancyGrid through a camera. Tiles are converted with
+    surfarray once and cached until an edit touches them; only tiles inside the
+    view are uploaded, sampled coarser when a cell is smaller than a pixel.
+    """
+    def __init__(self, grid, camera, cache_size=256):
+        self.grid = grid
+        self.camera = camera
+        self.cache_size = cache_size
+        self._tiles = OrderedDict()
+        
+        # Cell Value -> RGB (free white, occupied black, unknown gray)
+        self.palette = np.full((256, 3), 205, dtype=np.uint8)
+        _occupancy = np.arange(OccupancyGrid.OCCUPIED + 1) / OccupancyGrid.OCCUPIED
+        self.palette[:OccupancyGrid.OCCUPIED + 1] = (255 * (1 - _occupancy)).astype(np.uint8)[:, None]
+    
+    def tile(self, ty, tx, step):
+        """cached unscaled surface of tile (ty, tx) at sampling step"""
+        _key = (ty, tx, step)
+        _version = self.grid.tile_version(ty, tx, step)
+        _cached = self._tiles.get(_key)
+        if _cached is not None and _cached[0] == _version:
+            self._tiles.move_to_end(_key)
+            return _cached[1]
+        
+        _surface = pygame.surfarray.make_surface(self.palette[self.grid.tile(ty, tx, step).T])
+        self._tiles[_key] = (_version, _surface)
+        if len(self._tiles) > self.cache_size:
+            self._tiles.popitem(last=False)
+        return _surface
+    
+    def draw(self, surface):
+        """blit the visible tiles scaled and rotated to the camera view"""
+        _grid, _camera = self.grid, self.camera
+        
+        # Sample Every step-th Cell When Cells Are Below One Pixel
+        _pixels = _grid.resolution * _camera.scale
+        _step = 1 << max(0, int(np.ceil(np.log2(1 / _pixels)))) if _pixels < 1 else 1
+        _size = OccupancyGrid.TILE * _step * _grid.resolution
+        
+        # Tiles Overlapping The View
+        xmin, ymin, xmax, ymax = _camera.world_bounds()
+        _rows, _cols = _grid.tiles(_step)
+        ty0, ty1 = max(0, int((ymin - _grid.origin[1]) // _size)), min(_rows, int((ymax - _grid.origin[1]) // _size) + 1)
+        tx0, tx1 = max(0, int((xmin - _grid.origin[0]) // _size)), min(_cols, int((xmax - _grid.origin[0]) // _size) + 1)
+        
+        _angle = -np.degrees(_camera.rotation)
+        for ty in range(ty0, ty1):
+            for tx in range(tx0, tx1):
+                _tile = self.tile(ty, tx, _step)
+                _origin = _grid.origin + _size * np.array([tx, ty])
+                
+                # Crop To Cells Inside The View Before Scaling
+                _cell = _step * _grid.resolution
+                _first = np.clip(np.floor((np.array([xmin, ymin]) - _origin) / _cell), 0, _tile.get_size()).astype(int)
+                _last = np.clip(np.ceil((np.array([xmax, ymax]) - _origin) / _cell), 0, _tile.get_size()).astype(int)
+                if np.any(_last <= _first):
+                    continue
+                _tile = _tile.subsurface((*_first, *(_last - _first)))
+                _corner, _far = _origin + _cell * _first, _origin + _cell * _last
+                if _camera.rotation == 0:
+                    # Round Both Corners So Neighbouring Tiles Meet Without Seams
+                    _start, _end = np.round(_camera.apply(np.array([_corner, _far]))).astype(int)
+                    surface.blit(pygame.transform.scale(_tile, _end - _start), _start)
+                else:
+                    _scaled = pygame.transform.scale(_tile, np.ceil((_far - _corner) * _camera.scale).astype(int) + 1)
+                    # Pad Color Is The Colorkey So Corners Stay Transparent
+                    _scaled.set_colorkey((255, 0, 255))
+                    _rotated = pygame.transform.rotate(_scaled, _angle)
+                    surface.blit(_rotated, _rotated.get_rect(center=tuple(_camera.apply((_corner + _far) * 0.5))))
 
 # Map Screen Class
 class MapScreen:
-    def __init__(self, bgScreen, map=None):
+    def __init__(self, bgScreen, map=None, fleet=None, scale=1.0):
         # Set up the map display
         self.widthMapScreen = bgScreen[0]
         self.heightMapScreen = bgScreen[1]
@@ -101,88 +283,194 @@ class MapScreen:
         # Create a mask surface with transparency
         self._maskScreen = pygame.Surface((self.widthMapScreen, self.heightMapScreen), pygame.SRCALPHA)
         self._maskScreen.fill(TRANSPARENT)
-        # Draw Grid
-        if map is not None:
-            grid = [[0 for _ in range(map.width)] for _ in range(map.height)]
         
-        # Define Animation Timeframe
-        self.ticks = 0
+        # Get Map Border Point
+        _ratio = 0.95
+        self._pointRef = np.array([[(1-_ratio) * self.widthMapScreen, (1-_ratio) * self.heightMapScreen],
+                                   [(1-_ratio) * self.widthMapScreen, (_ratio) * self.heightMapScreen],
+                                   [(_ratio) * self.widthMapScreen, (_ratio) * self.heightMapScreen],
+                                   [(_ratio) * self.widthMapScreen, (1-_ratio) * self.heightMapScreen]])
+        self.mapRect = RobotOmni.bounding_rect(self._pointRef, margin=0)
+        
+        # World To Screen View Of The Map
+        self.camera = Camera(tuple(self.mapRect), scale)
+        
+        # Occupancy Grid Map (path or OccupancyGrid)
+        if isinstance(map, str):
+            map = OccupancyGrid.load(map)
+        self.map = map
+        self.gridView = GridView(map, self.camera) if map is not None else None
+        self._mapVersion = None
         
         # Create Object
         self.mobileRobot = RobotOmni("config\\drive\\fmlx_rover.yaml")
         
-        # Get Mission 
-        # TO:DO Only parse when there are input from button
-        self.bodyPose, self.bodyVel = Utility.parse_csv("mission\\test.csv")
+        # Laser Scanner (needs a map to scan), distance field built in the background on maps up to DISTANCE_MAX_CELLS
+        self.lidar = None
+        if map is not None and self.mobileRobot.lidarConfig is not None:
+            self.lidar = Lidar(map, distance=True, **Lidar.parameters(self.mobileRobot.lidarConfig))
+        self.scanPoints = None
+        self._scanTime = None
+        
+        # Get Fleet Trajectories (robots x time x 3, shorter ones hold their last pose)
+        self.fleetPose = None
+        if fleet is not None:
+            _length = max(len(traj) for traj in fleet)
+            self.fleetPose = np.stack([np.pad(traj, ((0, _length - len(traj)), (0, 0)), mode='edge') for traj in fleet])
+            self.player = TrajectoryPlayer(self.fleetPose)
+        else:
+            # Get Mission 
+            # TO:DO Only parse when there are input from button
+            self.bodyPose, self.bodyVel = Utility.parse_csv("mission\\test.csv")
+            self.player = TrajectoryPlayer(self.bodyPose)
+        
+        # Path History Layers
+        self.trails = []
+        if self.fleetPose is None:
+            self.trails.append(Trail(self.player.t, self.bodyPose[:,:2], GRAY, self.camera))
         
-    def draw(self, map=None):
+    def draw(self, surface):
+        """render the static map layer (background, occupancy grid, border, mask) onto surface"""
         # Define Map Screen Bg Color
-        self._mapScreen.fill(WHITE)
+        surface.fill(WHITE)
+        if self.gridView is not None:
+            surface.set_clip(self.mapRect)
+            self.gridView.draw(surface)
+            surface.set_clip(None)
+            self._mapVersion = self.map.version
+        self.drawGrid(surface)
         
-        # Get Map Border Point
-        _ratio = 0.95
-        self._pointRef = np.array([[(1-_ratio) * self.widthMapScreen, (1-_ratio) * self.heightMapScreen],
-                                   [(1-_ratio) * self.widthMapScreen, (_ratio) * self.heightMapScreen],
-                                   [(_ratio) * self.widthMapScreen, (_ratio) * self.heightMapScreen],
-                                   [(_ratio) * self.widthMapScreen, (1-_ratio) * self.heightMapScreen]])
         # Draw Map Border
-        pygame.draw.aalines(self._mapScreen, BLACK, 1, self._pointRef)
-    
-    def run(self):
-        # Draw Mobile Robot
-        self.mobileRobot.draw(self._mapScreen, self.bodyPose[0])
+        pygame.draw.aalines(surface, BLACK, 1, self._pointRef)
         
         # Draw Mask
         pygame.draw.polygon(self._maskScreen, WHITE, self._pointRef)
         
         # # Clip the drawing by blitting the mask onto the drawing surface
-        self._mapScreen.blit(self._maskScreen, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+        surface.blit(self._maskScreen, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+        
+        # Draw Trails Drawn So Far
+        surface.set_clip(self.mapRect)
+        for trail in self.trails: trail.redraw(surface)
+        surface.set_clip(None)
+    
+    def drawGrid(self, surface):
+        """world grid every 1/2/5 x 10^k units (at least 50 px apart), only lines inside the view"""
+        _spacing = 10.0 ** np.floor(np.log10(50 / self.camera.scale))
+        for _step in (1, 2, 5, 10):
+            if _spacing * _step * self.camera.scale >= 50: break
+        _spacing *= _step
+        
+        # Endpoints Of All Visible Lines, Transformed At Once
+        xmin, ymin, xmax, ymax = self.camera.world_bounds()
+        _xs = np.arange(np.ceil(xmin / _spacing) * _spacing, xmax, _spacing)
+        _ys = np.arange(np.ceil(ymin / _spacing) * _spacing, ymax, _spacing)
+        _lines = np.concatenate([np.stack([np.column_stack([_xs, np.full_like(_xs, ymin)]), np.column_stack([_xs, np.full_like(_xs, ymax)])], axis=1),
+                                 np.stack([np.column_stack([np.full_like(_ys, xmin), _ys]), np.column_stack([np.full_like(_ys, xmax), _ys])], axis=1)])
+        
+        surface.set_clip(self.mapRect)
+        for _start, _end in self.camera.apply(_lines):
+            pygame.draw.aaline(surface, LIGHTGRAY, _start, _end)
+        surface.set_clip(None)
+    
+    def mapChanged(self):
+        """occupancy grid edited since the static layer was drawn"""
+        return self.map is not None and self.map.version != self._mapVersion
+    
+    def setView(self):
+        """camera changed: re-project trails (static layer must be redrawn)"""
+        for trail in self.trails: trail.set_view()
+    
+    def drawTrails(self, surface):
+        """extend trails up to playback time on the static layer, return dirty rects (None after a rewind)"""
+        _time = self.player.time
+        if any(trail.rewound(_time) for trail in self.trails):
+            for trail in self.trails: trail.reset()
+            return None
+        
+        surface.set_clip(self.mapRect)
+        _rects = [trail.update(surface, _time) for trail in self.trails]
+        surface.set_clip(None)
+        return [_rect.clip(self.mapRect) for _rect in _rects if _rect is not None]
+    
+    def run(self, pose=None):
+        """draw the dynamic layer clipped to the map, return dirty rects"""
+        self._mapScreen.set_clip(self.mapRect)
+        
+        # Draw Mobile Robot (mission playback unless a pose is given)
+        if pose is None and self.fleetPose is not None:
+            _rects = self.mobileRobot.draw_batch(self._mapScreen, self.player.pose(), self.camera)
+        else:
+            _rects = [self.mobileRobot.draw(self._mapScreen, self.player.pose() if pose is None else pose, self.camera)]
+        
+        # Draw Laser Scan
+        if self.lidar is not None:
+            _rect = self.drawScan(self._mapScreen, pose)
+            if _rect is not None: _rects.append(_rect)
+        
+        self._mapScreen.set_clip(None)
+        return [_rect.clip(self.mapRect) for _rect in _rects]
 
-    def update(self, speed):
-        # Update Trajectory
-        if len(self.bodyPose) > 1:
-            self.bodyPose = self.bodyPose[1:]
+    def drawScan(self, surface, pose=None):
+        """scan at the sensor rate (playback time) and draw the returns, return dirty rect"""
+        # New Scan Once Per Sensor Period, Or After Rewind / Explicit Pose
+        _time = self.player.time
+        if pose is not None or self._scanTime is None or not (0 <= _time - self._scanTime < 1 / self.lidar.rate):
+            _poses = np.atleast_2d(self.player.pose() if pose is None else pose)
+            _ranges = self.lidar.scan(_poses)
+            _points = self.lidar.points(_poses, _ranges)[_ranges < self.lidar.max_range]
+            self.scanPoints = _points
+            self._scanTime = _time
+        if not len(self.scanPoints):
+            return None
         
-        # Update Ticks
-        self.ticks += 1*speed
-        pass
+        # Returns As Small Squares (fill honours the clip)
+        _screen = self.camera.apply(self.scanPoints)
+        for _x, _y in _screen.astype(int):
+            surface.fill(GREEN, (_x - 1, _y - 1, 3, 3))
+        return RobotOmni.bounding_rect(_screen)
+    
+    def update(self, elapsed, speed):
+        # Update Trajectory Playback
+        self.player.set_speed(speed)
+        self.player.update(elapsed)
 
 # Main GUI Application Class
 class Visualization:
-    def __init__(self, viz_config):
+    def __init__(self, viz_config, fleet=None, map=None):
         # Initialize Pygame
         pygame.init()
         
-        # Open YAML Config File
-        current_dir = dirname(__file__)
-        file_path = join(current_dir, viz_config)
+        # Shared YAML Config
+        viz = registry.viz(viz_config)
         
         # Set Constant
-        with open(file_path, 'r') as file:
-            viz = yaml.safe_load(file)
-            widthScreen  = viz["screen"]["width"]
-            heightScreen = viz["screen"]["height"]
-            
-            WheelViewScale = np.float32(viz["wheel_view"]["scale"])/100
-            if WheelViewScale > 3 : WheelViewScale = 3
-            WorldViewScale = np.float32(viz["world_view"]["scale"])/100
-            if WorldViewScale > 3 : WorldViewScale = 3
+        widthScreen  = viz["screen"]["width"]
+        heightScreen = viz["screen"]["height"]
+        
+        WheelViewScale = np.float32(viz["wheel_view"]["scale"])/100
+        if WheelViewScale > 3 : WheelViewScale = 3
+        WorldViewScale = np.float32(viz["world_view"]["scale"])/100
+        if WorldViewScale > 3 : WorldViewScale = 3
             
         # Constants Color
-        global BLACK,WHITE,GRAY,ORANGE,TEAL,RED,TRANSPARENT
+        global BLACK,WHITE,GRAY,LIGHTGRAY,ORANGE,TEAL,BLUE,RED,GREEN,TRANSPARENT
         BLACK  = (0, 0, 0)
         WHITE  = (255,255,255)
         GRAY   = (150, 150, 150)
+        LIGHTGRAY = (225, 225, 225)
         ORANGE = (255,165,0)
         TEAL   = (42, 157, 244)
+        BLUE   = (30, 90, 200)
         RED    = (196, 30, 58)
+        GREEN  = (46, 204, 113)
         TRANSPARENT = (0, 0, 0, 0)
         
         # Set up the background display
         self._bgScreen = pygame.display.set_mode((widthScreen, heightScreen))
         
         # Set up the map display
-        self._mapScreen = MapScreen((widthScreen, heightScreen))
+        self._mapScreen = MapScreen((widthScreen, heightScreen), map=map, fleet=fleet, scale=WorldViewScale)
         
         # Set up the wheel frame display
         # self._wheelScreen = pygame.display.set_mode((widthScreen, heightScreen))
@@ -195,59 +483,149 @@ class Visualization:
         self.clock = pygame.time.Clock()
         
         self.font = pygame.font.Font(None, 36)
+        self.frameTime = 0.0
+        
+        # Cached Static Layer and Last Frame Dirty Rects
+        self._staticLayer = None
+        self._dirtyRects = []
         
         # Create Object
         self.plusButton = Button("icons\\plus.png", 500, 500, 32, 32)
         self.minusButton = Button("icons\\minus.png", 500, 550, 32, 32)
         self.closeButton = Button("icons\\close.png", 500, 600, 32, 32)
         self.moreButton = Button("icons\\more.png", 500, 650, 32, 32)
-        self.slider = Slider(300, 100, 200, 20)
+        # Playback Speed in % (100 = real-time)
+        self.slider = Slider(300, 100, 200, 20, 0, 400)
+        self.slider.value = 100
 
     
     def run(self):
         while self.stateAnimation:
-            self.handle_events()
-            self.bgDraw()
-            
             # Update State
             self.update()
-            
-            # Draw All Buttons
-            self.plusButton.draw(self._bgScreen)
-            self.minusButton.draw(self._bgScreen)
-            self.closeButton.draw(self._bgScreen)
-            self.moreButton.draw(self._bgScreen)
-            
-            # Draw Map Screen
-            self._mapScreen.draw()
-            
-            # Run Robot
-            self._mapScreen.run()
-            
-            pygame.display.flip()
+            self.frame()
             self.clock.tick(60)
 
+    def frame(self, pose=None):
+        _start = time.perf_counter()
+        self.handle_events()
+        
+        # Render Static Layer Once (or after invalidate / map edit)
+        _full = self._staticLayer is None or self._mapScreen.mapChanged()
+        if _full:
+            self.staticDraw()
+        
+        # Extend Trails On Static Layer (full redraw after a rewind)
+        _trailRects = self._mapScreen.drawTrails(self._staticLayer)
+        if _trailRects is None:
+            _full = True
+            self.staticDraw()
+            _trailRects = []
+        
+        # Restore Areas Drawn Last Frame From Static Layer
+        for _rect in self._dirtyRects + _trailRects:
+            self._bgScreen.blit(self._staticLayer, _rect, _rect)
+        
+        # Run Robot
+        _rects = self._mapScreen.run(pose) + _trailRects
+        
+        # Draw Playback Speed Slider (dynamic, the handle moves while dragging)
+        _rects.append(self.slider.draw(self._bgScreen))
+        
+        # Draw FPS / Frame Time Counter
+        self.frameTime = time.perf_counter() - _start
+        _rects.append(self.drawStats())
+        
+        # Update Only Changed Areas
+        if _full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirtyRects + _rects)
+        self._dirtyRects = _rects
+
+    def staticDraw(self):
+        """pre-render background, map border and buttons into the cached static layer"""
+        self._staticLayer = pygame.Surface(self._bgScreen.get_size())
+        self.bgDraw(self._staticLayer)
+        
+        # Draw Map Screen
+        self._mapScreen.draw(self._staticLayer)
+        
+        # Draw All Buttons
+        self.plusButton.draw(self._staticLayer)
+        self.minusButton.draw(self._staticLayer)
+        self.closeButton.draw(self._staticLayer)
+        self.moreButton.draw(self._staticLayer)
+        
+        self._bgScreen.blit(self._staticLayer, (0, 0))
+        self._dirtyRects = []
+
+    def overlay_log(self, log, config_path):
+        """overlay GFC ground truth and RawtoENC odometry of a parse log as trails (log ms on the playback clock)"""
+        RawtoENC = log.get_RawtoENC(config_path)
+        self._mapScreen.trails.append(Trail(log.GFC[:,0] * 1e-3, log.GFC[:,1:3], TEAL, self._mapScreen.camera))
+        self._mapScreen.trails.append(Trail(RawtoENC[:,0] * 1e-3, RawtoENC[:,1:3], ORANGE, self._mapScreen.camera))
+        self.invalidate()
+
+    def invalidate(self):
+        """static content changed, re-render it on the next frame"""
+        self._staticLayer = None
+
+    def drawStats(self):
+        # Drawn On The Black Border Above The Map
+        _text = self.font.render(f"FPS: {self.clock.get_fps():.0f}  Frame: {self.frameTime*1e3:.1f} ms", True, WHITE)
+        return self._bgScreen.blit(_text, (10, 10))
+
+    def observe(self, simulation):
+        """Simulation observer: render the simulated pose (subscribe at the display rate)"""
+        self.frame(simulation.pose)
+        simulation.stop = not self.stateAnimation
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.stateAnimation = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self._mapScreen.player.toggle()
+                elif event.key == pygame.K_q:
+                    self._mapScreen.camera.rotate(np.radians(-15))
+                    self.viewChanged()
+                elif event.key == pygame.K_e:
+                    self._mapScreen.camera.rotate(np.radians(15))
+                    self.viewChanged()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if self.closeButton.is_hovered(event.pos):
                         print("Close Button clicked!")
                     if self.moreButton.is_hovered(event.pos):
                         print("Options Button clicked!")
+                    self.handleZoom(event)
+            elif event.type == pygame.MOUSEWHEEL:
+                self._mapScreen.camera.zoom(1.25 ** event.y, pygame.mouse.get_pos())
+                self.viewChanged()
+            elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                # Pan With Right Mouse Drag
+                self._mapScreen.camera.pan(*event.rel)
+                self.viewChanged()
                         
             self.slider.handle_event(event)
 
     def handleZoom(self, event):
         if event.button == 1:
             if self.plusButton.is_hovered(event.pos):
-                zoomLevel *= 1.25
+                self._mapScreen.camera.zoom(1.25)
+                self.viewChanged()
                 print("Zoom Plus Button clicked!")
             if self.minusButton.is_hovered(event.pos):
-                zoomLevel /= 1.25
+                self._mapScreen.camera.zoom(1/1.25)
+                self.viewChanged()
                 print("Zoom Minus Button clicked!")       
+
+    def viewChanged(self):
+        """re-project view dependent layers after a camera change"""
+        self._mapScreen.setView()
+        self.invalidate()
     
     # def handleFiles(self, event, trajectory):
     #     if event.button == 1:
@@ -256,10 +634,10 @@ class Visualization:
         
     def update(self):
         # Update All Screen Available
-        self._mapScreen.update(1)
+        self._mapScreen.update(self.clock.get_time() * 1e-3, self.slider.value / 100)
 
-    def bgDraw(self):
-        self._bgScreen.fill(WHITE)
+    def bgDraw(self, surface):
+        surface.fill(WHITE)
 
     def quit(self):
         pygame.quit()
@@ -0,0 +1,62 @@
+import numpy as np
+
+class TrajectoryPlayer:
+    """
+    Time-driven playback of a (N,3) [x, y, theta] trajectory, or (R,N,3) for R robots
+    sharing one timeline. A cursor into the sample times follows a playback clock,
+    so playback speed is independent of frame rate and the trajectory array is
+    never modified.
+    """
+    def __init__(self, poses, dt=0.02, t=None):
+        self.poses = poses
+        self.t = np.arange(poses.shape[-2]) * dt if t is None else np.asarray(t, dtype=np.float64)
+        self.time = self.t[0]
+        self.cursor = 0
+        self.speed = 1.0
+        self.playing = True
+
+    def play(self):
+        self.playing = True
+
+    def pause(self):
+        self.playing = False
+
+    def toggle(self):
+        self.playing = not self.playing
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    def finished(self) -> bool:
+        return self.time >= self.t[-1]
+
+    def update(self, elapsed):
+        """advance the playback clock by elapsed wall-clock seconds"""
+        if self.playing:
+            self.seek(self.time + elapsed * self.speed)
+
+    def seek(self, time):
+        """move playback clock to time (clamped to the trajectory)"""
+        self.time = min(max(time, self.t[0]), self.t[-1])
+        last = max(len(self.t) - 2, 0)
+
+        # Step forward for normal playback, binary search for jumps and rewinds
+        if self.t[self.cursor] <= self.time and (self.cursor >= last or self.time < self.t[self.cursor+2]):
+            while self.cursor < last and self.t[self.cursor+1] <= self.time:
+                self.cursor += 1
+        else:
+            self.cursor = min(int(np.searchsorted(self.t, self.time, side='right')) - 1, last)
+
+    def pose(self):
+        """pose at the playback clock, interpolated between the bracketing samples"""
+        k = self.cursor
+        if k + 1 >= len(self.t):
+            return self.poses[..., k, :]
+        w = (self.time - self.t[k]) / (self.t[k+1] - self.t[k])
+        p0, p1 = self.poses[..., k, :], self.poses[..., k+1, :]
+        pose = p0 + (p1 - p0) * w
+
+        # Heading along the shortest arc
+        dth = (p1[...,2] - p0[...,2] + np.pi) % (2*np.pi) - np.pi
+        pose[...,2] = p0[...,2] + dth * w
+        return pose
@@ -0,0 +1,65 @@
+############################################
+#        SHARED ROBOT / CONFIG REGISTRY    #
+#  Drive and viz YAMLs are loaded once per #
+#  process into immutable descriptions     #
+############################################
+
+import numpy as np
+from functools import lru_cache
+from os.path import getmtime
+
+from kinematics import kinematics, indexed
+from include.Utility.utility import Config, Utility
+
+class Robot:
+    """
+    Immutable description of a drive config: frozen YAML, compiled kinematics
+    (shared by every user of the config) and robot frame footprint polygons.
+    """
+    __slots__ = ("path", "config", "model", "kinematics", "body", "wheels", "lidar")
+
+    def __init__(self, path, config, Kinematics, body, wheels):
+        for name, value in (("path", path), ("config", config), ("model", config["model"]),
+                            ("kinematics", Kinematics), ("body", body), ("wheels", wheels),
+                            ("lidar", config.get("lidar"))):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("robot descriptions are immutable")
+
+    @property
+    def footprint(self):
+        """(4 + 4*wheels, 2) body then wheel polygon vertices"""
+        return np.vstack([self.body, self.wheels.reshape(-1,2)])
+
+def readonly(array):
+    array.flags.writeable = False
+    return array
+
+@lru_cache(maxsize=None)
+def describe(file_path, mtime):
+    """build the Robot description of a drive config file version"""
+    config = Config.parse(file_path, mtime)
+    body = config["body"]
+
+    # Wheel Polygons Only Drawn For Omni Wheels (other models: body outline only)
+    if config["model"] == "omni":
+        # Wheels Ordered By Key Index, Like The Kinematics Rows
+        dn = indexed(config["axle_length"])
+        bn = np.radians(indexed(config["axle_angle"]))
+        yn = np.radians(indexed(config["wheel_angle"]))
+        rw, width = config["wheel"]["rw"], config["wheel"]["width"]
+    else:
+        dn = bn = yn = np.empty(0)
+        rw, width = 1.0, 0.0
+    outline, wheels = Utility.omni_footprint(body["width"], body["length"], dn, bn, yn, rw, width)
+    return Robot(file_path, config, kinematics(file_path), readonly(outline), readonly(wheels))
+
+def robot(path):
+    """shared Robot description of a drive config (rebuilt only when the file changes)"""
+    file_path = Config.resolve(path)
+    return describe(file_path, getmtime(file_path))
+
+def viz(path):
+    """shared immutable viz config"""
+    return Config.load(path)
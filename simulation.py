@@ -0,0 +1,93 @@
+############################################
+#      HEADLESS FIXED-TIMESTEP SIMULATOR   #
+#  Steps robot state from mission setpoint #
+#  independent of rendering frame rate     #
+############################################
+
+import time
+import numpy as np
+from os.path import dirname, join
+
+import registry
+from PID import setpoint
+from include.Utility.utility import Utility
+
+class Simulation:
+    """
+    Fixed-timestep simulation of a mobile robot following mission setpoints.
+    Each step converts the setpoint twist to wheel commands (inverse kinematics),
+    back to the body twist the wheels produce (forward kinematics) and integrates
+    the pose. Observers (e.g. rendering) are called at their own, lower rate.
+    With a PID controller attached the setpoint twist is corrected by the pose error.
+    """
+    def __init__(self, config_path, mission_path, dt=0.01, mission_dt=0.02, controller=None):
+        self.Kinematics = registry.robot(config_path).kinematics
+        self.bodyPose, self.bodyVel = Utility.parse_csv(mission_path)
+        self.dt = dt
+        self.mission_dt = mission_dt
+        self.controller = controller
+        self.duration = (len(self.bodyVel) - 1) * mission_dt
+        self.observers = []
+        self.reset()
+
+        # Observers may set stop to end a run early (e.g. window closed)
+        self.stop = False
+
+    def reset(self):
+        self.t = 0.0
+        self.steps = 0
+        self.pose = np.array(self.bodyPose[0], dtype=np.float64)
+        self.wheel = np.zeros(self.Kinematics.wheels)
+        if self.controller is not None: self.controller.reset()
+        for observer in self.observers: observer[2] = 0.0
+
+    def subscribe(self, callback, rate_hz):
+        """call callback(simulation) every 1/rate_hz seconds of simulated time"""
+        self.observers.append([callback, 1.0/rate_hz, self.t])
+
+    def setpoint(self, t):
+        """mission body twist (global frame) at time t, zero-order hold between samples"""
+        k = min(int(t / self.mission_dt), len(self.bodyVel) - 1)
+        return self.bodyVel[k]
+
+    def step(self):
+        # Setpoint Twist (closed loop on pose with a controller)
+        twist = self.setpoint(self.t)
+        if self.controller is not None:
+            twist = self.controller.update(setpoint(self.bodyPose, self.bodyVel, self.t, self.mission_dt)[0], twist, self.pose)
+        
+        # Wheel Command From Setpoint
+        self.wheel = self.Kinematics.inverse(self.Kinematics.rotation("local", twist, self.pose[2]))
+
+        # Body Twist Produced By Wheels
+        body = self.Kinematics.rotation("global", self.Kinematics.forward(self.wheel), self.pose[2])
+
+        # Update Pose
+        self.pose += body * self.dt
+        self.pose[2] = (self.pose[2] + np.pi) % (2*np.pi) - np.pi
+        self.steps += 1
+        self.t = self.steps * self.dt
+
+        # Notify Observers
+        for observer in self.observers:
+            if self.t >= observer[2]:
+                observer[0](self)
+                observer[2] += observer[1]
+
+    def run(self, duration=None):
+        """step as fast as possible until duration (default: end of mission)"""
+        end = self.duration if duration is None else duration
+        while self.t < end and not self.stop:
+            self.step()
+        return self
+
+# Headless Mission Replay
+if __name__ == "__main__":
+    current_dir = dirname(__file__)
+    sim = Simulation(join("config", "drive", "fmlx_rover.yaml"), join(current_dir, "mission", "test.csv"))
+
+    t0 = time.perf_counter()
+    sim.run()
+    elapsed = time.perf_counter() - t0
+    print(f"{sim.steps} steps ({sim.t:.2f} s simulated) in {elapsed:.3f} s -> x{sim.t/elapsed:.0f} real-time")
+    print(f"Final Pose -> X: {sim.pose[0]:.2f} Y: {sim.pose[1]:.2f} Theta: {np.degrees(sim.pose[2]):.2f}")
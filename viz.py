@@ -1,26 +1,17 @@
 import pygame
 import pygame.gfxdraw
 import numpy as np
-import yaml
-from os.path import dirname, join
+import registry
 from csv_parse import csv
+from player import TrajectoryPlayer
+from kinematics import indexed
+from include.Utility.utility import Utility
 
 # Color
 black  = (0, 0, 0)
 orange = (255,165,0)
 teal   = (42, 157, 244)
 
-def Rt_2D(th):
-    return np.array([[np.cos(th), -np.sin(th)], [np.sin(th), np.cos(th)]])
-
-def Rt_2DCenterRef(reference, pose):
-    # Transform Body -> Back to Origin (0,0) -> Rotate -> Translate Back to World Frame
-    _rotated = np.zeros_like(reference)
-    _rotated = reference - np.array([pose[0], pose[1]])
-    for n in range(len(reference)): _rotated[n] = (Rt_2D(pose[2]) @ _rotated[n].reshape(-1,1)).reshape(1,-1)
-    _rotated += np.array([pose[0], pose[1]])
-    return _rotated
-    
 def show_mouse_coordinate(screen, res, tcolor, font, fontsize):
     # Get World Frame Coordinate
     x, y = pygame.mouse.get_pos()
@@ -48,31 +39,18 @@ def draw_arrow(screen, color, start, end, trirad, thickness=2):
 
 def draw_robot(screen, color, pose, size):
     # Robot Body Point Reference
-    _pointRef = np.array([[pose[0]-size[0]*0.5, pose[1]-size[1]*0.5],
-                          [pose[0]+size[0]*0.5, pose[1]-size[1]*0.5],
-                          [pose[0]+size[0]*0.5, pose[1]+size[1]*0.5],
-                          [pose[0]-size[0]*0.5, pose[1]+size[1]*0.5]])
-
-    # Robot Wheel Point Reference
-    _pointRef = np.array([[pose[0]-size[0]*0.5, pose[1]-size[1]*0.5],
-                          [pose[0]+size[0]*0.5, pose[1]-size[1]*0.5],
-                          [pose[0]+size[0]*0.5, pose[1]+size[1]*0.5],
-                          [pose[0]-size[0]*0.5, pose[1]+size[1]*0.5]])
+    _pointRef = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]]) * np.array(size)
     
-    for i in range(len(dn)):
-        _wheelAngleRef = np.array([[pose[0] + (dn[i] * np.cos(bn[i]) - wheelRadius * np.sin(yn[i] + bn[i])), pose[1] + (dn[i] * -np.sin(bn[i]) - wheelRadius * np.cos(yn[i] + bn[i]))],
-                                   [pose[0] + (dn[i] * np.cos(bn[i]) + wheelRadius * np.sin(yn[i] + bn[i])), pose[1] + (dn[i] * -np.sin(bn[i]) + wheelRadius * np.cos(yn[i] + bn[i]))]])
- 
-        _wheelRef = np.array([[_wheelAngleRef[0,0] + wheelWidth * 0.5 * -(_wheelAngleRef[1,1]-_wheelAngleRef[0,1])/(2*wheelRadius), _wheelAngleRef[0,1] + wheelWidth * 0.5 * (_wheelAngleRef[1,0]-_wheelAngleRef[0,0])/(2*wheelRadius)],
-                              [_wheelAngleRef[0,0] + wheelWidth * 0.5 * (_wheelAngleRef[1,1]-_wheelAngleRef[0,1])/(2*wheelRadius), _wheelAngleRef[0,1] + wheelWidth * 0.5 * -(_wheelAngleRef[1,0]-_wheelAngleRef[0,0])/(2*wheelRadius)],
-                              [_wheelAngleRef[1,0] + wheelWidth * 0.5 * (_wheelAngleRef[1,1]-_wheelAngleRef[0,1])/(2*wheelRadius), _wheelAngleRef[1,1] + wheelWidth * 0.5 * -(_wheelAngleRef[1,0]-_wheelAngleRef[0,0])/(2*wheelRadius)],
-                              [_wheelAngleRef[1,0] + wheelWidth * 0.5 * -(_wheelAngleRef[1,1]-_wheelAngleRef[0,1])/(2*wheelRadius), _wheelAngleRef[1,1] + wheelWidth * 0.5 * (_wheelAngleRef[1,0]-_wheelAngleRef[0,0])/(2*wheelRadius)]])
+    # Transform Body + Precomputed Wheels To World Frame
+    _points = Utility.transform_2D(np.vstack([_pointRef, wheelRef.reshape(-1,2)]), pose)
+    
+    for _wheelRef in _points[4:].reshape(-1,4,2):
         # Draw Wheel Lines
-        pygame.gfxdraw.filled_polygon(screen, Rt_2DCenterRef(_wheelRef, pose), color)
-        pygame.gfxdraw.aapolygon(screen, Rt_2DCenterRef(_wheelRef, pose), color)
+        pygame.gfxdraw.filled_polygon(screen, _wheelRef, color)
+        pygame.gfxdraw.aapolygon(screen, _wheelRef, color)
 
     # Draw Robot Body Lines
-    pygame.draw.aalines(screen, color, True, Rt_2DCenterRef(_pointRef, pose), 3)
+    pygame.draw.aalines(screen, color, True, _points[:4], 3)
 
 def parse_csv():
     # Load data from CSV
@@ -93,34 +71,33 @@ def parse_csv():
     
     return pose
     
-# Open YAML Config File
-current_dir = dirname(__file__)
-file_path = join(current_dir, "config\\drive\\fmlx_rover.yaml")
+# Shared Robot Description (YAML parsed once per process)
+description = registry.robot("config\\drive\\fmlx_rover.yaml")
+robot = description.config
 
-with open(file_path, 'r') as file:
-    robot = yaml.safe_load(file)
-    
-    robotWidth = robot["body"]["width"]
-    robotHeight= robot["body"]["height"]
-    robotLength = robot["body"]["length"]
-    wheelRadius = np.float32(robot["wheel"]["rw"])
-    wheelWidth = np.float32(robot["wheel"]["width"])
-    
-    dn = np.array([val for (key,val) in robot["axle_length"].items()], dtype='f8')
-    bn = np.array([np.radians(val) for (key,val) in robot["axle_angle"].items()], dtype='f8')
-    yn = np.array([np.radians(val) for (key,val) in robot["wheel_angle"].items()], dtype='f8')
+robotWidth = robot["body"]["width"]
+robotHeight= robot["body"]["height"]
+robotLength = robot["body"]["length"]
+wheelRadius = np.float32(robot["wheel"]["rw"])
+wheelWidth = np.float32(robot["wheel"]["width"])
+
+# Wheels Ordered By Key Index, Like The Kinematics Rows
+dn = indexed(robot["axle_length"])
+bn = np.radians(indexed(robot["axle_angle"]))
+yn = np.radians(indexed(robot["wheel_angle"]))
+
+# Robot Frame Wheel Polygons
+wheelRef = description.wheels
 
 # Set Screen Size    
-file_path = join(current_dir, "config\\viz\\viz.yaml")
-with open(file_path, 'r') as file:
-    viz = yaml.safe_load(file)
-    widthScreen  = viz["screen"]["width"]
-    heightScreen = viz["screen"]["height"]
-    quiverLength = np.float32(viz["wheel_view"]["quiver_length"])
-    WheelViewScale = np.float32(viz["wheel_view"]["scale"])/100
-    if WheelViewScale > 3 : WheelViewScale = 3
-    WorldViewScale = np.float32(viz["world_view"]["scale"])/100
-    if WorldViewScale > 3 : WorldViewScale = 3
+viz = registry.viz("config\\viz\\viz.yaml")
+widthScreen  = viz["screen"]["width"]
+heightScreen = viz["screen"]["height"]
+quiverLength = np.float32(viz["wheel_view"]["quiver_length"])
+WheelViewScale = np.float32(viz["wheel_view"]["scale"])/100
+if WheelViewScale > 3 : WheelViewScale = 3
+WorldViewScale = np.float32(viz["world_view"]["scale"])/100
+if WorldViewScale > 3 : WorldViewScale = 3
     
 # Set Robot Wheel View Screen
 widthWheelViewScreen = widthScreen/3
@@ -159,8 +136,8 @@ traj = parse_csv()
 # traj = np.array([0, heightScreen, 0]) - traj
 
 
-# set ticks
-ticks = 0
+# Trajectory Playback
+player = TrajectoryPlayer(traj)
 #---------------------------------------------------------------------------- TEST CODE END ----------------------------------------------------------------------------
 while animationState:
     # Track User Interaction
@@ -179,10 +156,8 @@ while animationState:
     
     
 #--------------------------------------------------------------------------- TEST CODE START ---------------------------------------------------------------------------
-    draw_robot(screen, black, traj[0], (robotWidth,robotLength))
-    if len(traj) > 1 and ticks%10 == 0:
-        traj = traj[1:]
-    ticks += 2
+    draw_robot(screen, black, player.pose(), (robotWidth,robotLength))
+    player.update(clock.get_time() * 1e-3)
 #---------------------------------------------------------------------------- TEST CODE END ----------------------------------------------------------------------------
 
     # Draw Body Lines